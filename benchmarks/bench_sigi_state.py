@@ -0,0 +1,109 @@
+"""
+Micro-benchmark for profile page parsing.
+
+    python -m benchmarks.bench_sigi_state [page.html ...]
+
+Pass captured TikTok profile pages (saved with e.g. `curl -A <mobile UA>
+https://www.tiktok.com/@user > page.html`) to benchmark against real data.
+Without arguments a synthetic page of comparable size is generated.
+"""
+import json
+import re
+import sys
+import timeit
+from pathlib import Path
+
+from tiktok.sigi_state import (
+    SigiStateScanner,
+    decode_user_module,
+    orjson,
+)
+
+CHUNK_SIZE = 16 * 1024
+
+
+def synthetic_page(username: str = "benchuser", items: int = 300) -> bytes:
+    item_module = {
+        str(7300000000000000000 + i): {
+            "id": str(7300000000000000000 + i),
+            "desc": "video description " * 8,
+            "author": username,
+            "stats": {"diggCount": i * 13, "playCount": i * 101, "shareCount": i},
+            "music": {"title": "original sound", "authorName": username},
+            "challenges": [{"title": f"tag{j}", "desc": ""} for j in range(5)],
+        }
+        for i in range(items)
+    }
+    state = {
+        "AppContext": {"appContext": {"language": "en", "region": "GB"}},
+        "ItemModule": item_module,
+        "UserModule": {
+            "users": {
+                username: {
+                    "uniqueId": username,
+                    "isLive": False,
+                    "liveRoomId": "",
+                    "nickname": "Bench User",
+                }
+            },
+            "stats": {
+                username: {"followerCount": 12345, "heartCount": 678910, "videoCount": items}
+            },
+        },
+        "SEO": {"metaParams": {"title": "x" * 200}},
+    }
+    head = b"<!DOCTYPE html><html><head>" + b"<meta name='x' content='y'>" * 2000
+    blob = b'<script id="SIGI_STATE" type="application/json">' + json.dumps(state).encode() + b"</script>"
+    tail = b"<div>" + b"<span>footer</span>" * 5000 + b"</div></body></html>"
+    return head + blob + tail
+
+
+def _username_of(page: bytes) -> str:
+    match = re.search(rb'"uniqueId"\s*:\s*"([^"]+)"', page)
+    return match.group(1).decode() if match else ""
+
+
+def _scan(page: bytes) -> bytes:
+    scanner = SigiStateScanner()
+    for i in range(0, len(page), CHUNK_SIZE):
+        if scanner.feed(page[i:i + CHUNK_SIZE]):
+            break
+    return scanner.blob
+
+
+def _legacy(page: bytes, username: str):
+    html = page.decode("utf-8")
+    match = re.search(r'<script id="SIGI_STATE"[^>]*>(.*?)</script>', html, re.DOTALL)
+    data = json.loads(match.group(1))
+    return data["UserModule"]["users"].get(username)
+
+
+def bench(name: str, page: bytes, number: int = 50):
+    username = _username_of(page)
+    blob = _scan(page)
+    print(f"{name}: page {len(page) / 1024:.0f} KB, SIGI_STATE {len(blob) / 1024:.0f} KB")
+
+    cases = {
+        "legacy (decode page + regex + json.loads)": lambda: _legacy(page, username),
+        "stream scan only": lambda: _scan(page),
+        "stream + full decode (json)": lambda: json.loads(_scan(page)),
+        "stream + targeted UserModule decode": lambda: decode_user_module(_scan(page), username),
+    }
+    if orjson is not None:
+        cases["stream + full decode (orjson)"] = lambda: orjson.loads(_scan(page))
+
+    for label, fn in cases.items():
+        best = min(timeit.repeat(fn, number=number, repeat=5)) / number
+        print(f"  {label:<44} {best * 1000:8.3f} ms")
+
+
+def main(argv):
+    if argv:
+        for path in argv:
+            bench(path, Path(path).read_bytes())
+    else:
+        bench("synthetic", synthetic_page())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -11,14 +11,10 @@ from config.feature_flags import FeatureFlags
 from utils.logger import log
 from utils.uptime import Uptime
 from utils.system_monitor import SystemMonitor
+from utils.scheduler import Scheduler
 
-from tiktok.tiktok_api import TikTokAPI
-from tiktok.polling_engine import PollingEngine
-from tiktok.live_mode_engine import LiveModeEngine
-from tiktok.live_summary_engine import LiveSummaryEngine
-from tiktok.final_summary_engine import FinalSummaryEngine
-from tiktok.video_upload_engine import VideoUploadEngine
-from tiktok.daily_save_engine import DailySaveEngine
+from tiktok.transport import TikTokTransport
+from tiktok.creators import CreatorRegistry
 from tiktok.daily_summary_engine import DailySummaryEngine
 
 from discord_bot.discord_events import DiscordBot
@@ -27,6 +23,10 @@ from terminal.input_handler import InputHandler
 from terminal.log_window import LogWindow
 
 
+# Seconds between system monitor (battery) checks
+SYSTEM_MONITOR_INTERVAL = 3600
+
+
 class BotOrchestrator:
     def __init__(self):
         # Paths + config
@@ -42,14 +42,32 @@ class BotOrchestrator:
 
         # System monitor
         self.system_monitor = SystemMonitor()
+        self._last_battery_warning = None
 
         # Log window (CLI)
         self.log_window = LogWindow()
         log.log_window = self.log_window
 
-        # TikTok API
-        username = self.config.get("tiktok_username", "")
-        self.tiktok = TikTokAPI(username)
+        # TikTok transport (shared session + parse pool) and the job scheduler
+        self.transport = TikTokTransport(
+            http_config=self.config.get("http"),
+            parsing_config=self.config.get("parsing"),
+            rate_limit_config=self.config.get("rate_limit"),
+            intervals=self.config.get("intervals"),
+        )
+        sched_cfg = self.config["scheduler"]
+        self.scheduler = Scheduler(
+            max_concurrency=sched_cfg["max_concurrency"],
+            jitter=sched_cfg["jitter"],
+            align=sched_cfg["align"],
+        )
+
+        # Creators (one set of engines each, driven by the shared scheduler)
+        self.creator_registry = CreatorRegistry(
+            self.cfg_mgr, self.paths, self.transport, self.scheduler
+        )
+        self.creator_registry.on_creator_added = self._wire_creator
+        self.creator_registry.load()
 
         # Engines
         self._init_engines()
@@ -64,10 +82,7 @@ class BotOrchestrator:
             config_manager=self.cfg_mgr,
             feature_flags=self.feature_flags,
             paths=self.paths,
-            polling_engine=self.polling_engine,
-            live_summary_engine=self.live_summary_engine,
-            final_summary_engine=self.final_summary_engine,
-            video_upload_engine=self.video_upload_engine,
+            creator_registry=self.creator_registry,
             daily_summary_engine=self.daily_summary_engine,
             uptime=self.uptime,
         )
@@ -76,13 +91,11 @@ class BotOrchestrator:
         self.console_commands = ConsoleCommands(
             config_manager=self.cfg_mgr,
             feature_flags=self.feature_flags,
-            polling_engine=self.polling_engine,
-            live_summary_engine=self.live_summary_engine,
-            final_summary_engine=self.final_summary_engine,
-            video_upload_engine=self.video_upload_engine,
+            creator_registry=self.creator_registry,
             daily_summary_engine=self.daily_summary_engine,
             uptime=self.uptime,
             log_window=self.log_window,
+            dispatcher=self.discord_bot.dispatcher,
         )
 
         self.input_handler = InputHandler(self.console_commands)
@@ -91,85 +104,75 @@ class BotOrchestrator:
     # Engine initialization
     # ----------------------------------------------------------------------
     def _init_engines(self):
-        self.polling_engine = PollingEngine(
-            self.cfg_mgr,
-            self.tiktok,
-            self.config["intervals"]["offline"],
-        )
-
-        self.live_mode_engine = LiveModeEngine(self.cfg_mgr, self.tiktok)
-
-        self.live_summary_engine = LiveSummaryEngine(
-            self.cfg_mgr,
-            self.tiktok,
-            self.config["intervals"]["live_summary"],
-        )
-
-        self.final_summary_engine = FinalSummaryEngine(self.cfg_mgr)
-
-        self.video_upload_engine = VideoUploadEngine(
-            self.cfg_mgr,
-            self.tiktok,
-            self.config["intervals"]["video"],
-        )
-
-        self.daily_save_engine = DailySaveEngine(
-            self.cfg_mgr,
-            self.tiktok,
-            self.paths.daily_dir,
-            self.config["intervals"]["daily"],
-        )
-
         self.daily_summary_engine = DailySummaryEngine(
             self.cfg_mgr,
-            self.paths.daily_dir,
+            self.creator_registry,
+            self.paths.daily_summary_state_file,
         )
 
     # ----------------------------------------------------------------------
-    # Engine wiring
+    # Engine wiring (send_* only queue on the Discord dispatcher, so
+    # awaiting them never holds up an engine)
     # ----------------------------------------------------------------------
-    def _wire_engines(self):
+    def _wire_creator(self, creator):
+        username = creator.username
+
         async def on_live_start(stats):
-            log.info("LIVE START detected")
-            asyncio.create_task(self.live_mode_engine.start())
-            asyncio.create_task(self.live_summary_engine.start())
-            asyncio.create_task(self.discord_bot.send_live_notification(stats))
+            log.info(f"LIVE START detected for @{username}")
+            await self.discord_bot.send_live_notification(stats, username=username)
+
+        creator.live_session.on_live_start = on_live_start
+
+        async def on_live_sample(stats):
+            await self.discord_bot.update_live_status(
+                stats, username=username, started_at=creator.live_session.started_at
+            )
 
-        self.polling_engine.on_live_start = on_live_start
+        creator.live_session.on_sample = on_live_sample
 
-        async def on_live_end():
-            log.info("LIVE END detected")
-            await self.final_summary_engine.run({"end": True})
-            self.live_summary_engine.stop()
+        async def on_live_end(summary):
+            log.info(f"LIVE END detected for @{username}")
+            await self.discord_bot.finish_live_status(summary, username=username)
+            if summary:
+                await creator.final_summary_engine.run(summary)
             # if you later want a dedicated live-end notification, add:
-            # asyncio.create_task(self.discord_bot.send_live_end_notification())
+            # await self.discord_bot.send_live_end_notification()
 
-        self.live_mode_engine.on_live_end = on_live_end
+        creator.live_session.on_live_end = on_live_end
 
         async def on_live_summary(stats):
-            log.info(f"Live summary: {stats}")
+            log.info(f"Live summary for @{username}: {stats}")
             summary_text = str(stats)
-            asyncio.create_task(self.discord_bot.send_live_summary(summary_text))
+            await self.discord_bot.send_live_summary(summary_text, username=username)
 
-        self.live_summary_engine.on_summary = on_live_summary
+        creator.live_session.on_summary = on_live_summary
 
         async def on_final_summary(data):
-            log.info(f"Final summary: {data}")
-            summary_text = str(data)
-            asyncio.create_task(self.discord_bot.send_final_summary(summary_text))
+            log.info(f"Final summary for @{username}: {data}")
+            summary_text = creator.final_summary_engine.format(data)
+            await self.discord_bot.send_final_summary(
+                summary_text,
+                username=username,
+                msg_id=f"final:{username}:{int(data['started_at'])}",
+            )
 
-        self.final_summary_engine.on_final_summary = on_final_summary
+        creator.final_summary_engine.on_final_summary = on_final_summary
 
         async def on_new_video(video_id):
-            log.info(f"New video detected: {video_id}")
-            asyncio.create_task(self.discord_bot.send_new_video(video_id))
+            log.info(f"New video detected for @{username}: {video_id}")
+            await self.discord_bot.send_new_video(video_id, username=username)
 
-        self.video_upload_engine.on_new_video = on_new_video
+        creator.video_upload_engine.on_new_video = on_new_video
 
+    def _wire_engines(self):
         async def on_daily_summary(summary):
             log.info(f"Daily summary: {summary}")
             summary_text = str(summary)
-            asyncio.create_task(self.discord_bot.send_daily_summary(summary_text))
+            await self.discord_bot.send_daily_summary(
+                summary_text,
+                username=summary.get("username"),
+                msg_id=f"daily:{summary.get('username')}:{summary.get('date')}",
+            )
 
         self.daily_summary_engine.on_daily_summary = on_daily_summary
 
@@ -179,30 +182,28 @@ class BotOrchestrator:
     async def start_engines(self):
         log.info("Starting all engines...")
 
-        asyncio.create_task(self.polling_engine.start())
-        asyncio.create_task(self.video_upload_engine.start())
-        asyncio.create_task(self.daily_save_engine.start())
-        asyncio.create_task(self.daily_summary_engine.start())
-        asyncio.create_task(self._system_monitor_loop())
-        # TikTokLive listener
-        asyncio.create_task(self.tiktok.start_live_listener())
+        # Messages a previous run couldn't deliver go out first
+        await self.discord_bot.dispatcher.replay()
+
+        self.daily_summary_engine.start()
+        self.scheduler.add_job(
+            "system_monitor",
+            self._system_monitor_tick,
+            lambda: SYSTEM_MONITOR_INTERVAL,
+        )
+        asyncio.create_task(self.scheduler.start())
 
     # ----------------------------------------------------------------------
-    # System monitor loop
+    # System monitor
     # ----------------------------------------------------------------------
-    async def _system_monitor_loop(self):
-        last_warning = None
-
-        while True:
-            self.system_monitor.update()
+    async def _system_monitor_tick(self):
+        self.system_monitor.update()
 
-            pct = self.system_monitor.battery_monitor.get_battery_percent()
-            if pct is not None and pct <= self.system_monitor.battery_monitor.threshold:
-                if last_warning != pct:  # prevent spam
-                    last_warning = pct
-                    await self.discord_bot.send_battery_warning(pct)
-
-            await asyncio.sleep(3600)
+        pct = self.system_monitor.battery_monitor.get_battery_percent()
+        if pct is not None and pct <= self.system_monitor.battery_monitor.threshold:
+            if self._last_battery_warning != pct:  # prevent spam
+                self._last_battery_warning = pct
+                await self.discord_bot.send_battery_warning(pct)
 
     # ----------------------------------------------------------------------
     # CLI loop
@@ -260,27 +261,23 @@ def main():
     def shutdown():
         log.info("Shutting down engines...")
         try:
-            orchestrator.polling_engine.stop()
-        except Exception:
-            pass
-        try:
-            orchestrator.live_mode_engine.stop()
+            orchestrator.scheduler.stop()
         except Exception:
             pass
         try:
-            orchestrator.live_summary_engine.stop()
+            orchestrator.creator_registry.stop()
         except Exception:
             pass
         try:
-            orchestrator.video_upload_engine.stop()
+            orchestrator.daily_summary_engine.stop()
         except Exception:
             pass
         try:
-            orchestrator.daily_save_engine.stop()
+            orchestrator.discord_bot.live_status.stop()
         except Exception:
             pass
         try:
-            orchestrator.daily_summary_engine.stop()
+            orchestrator.discord_bot.dispatcher.stop()
         except Exception:
             pass
 
@@ -307,6 +304,14 @@ def main():
     except RuntimeError:
         shutdown()
     finally:
+        try:
+            loop.run_until_complete(orchestrator.creator_registry.close())
+        except Exception:
+            pass
+        try:
+            loop.run_until_complete(orchestrator.transport.close())
+        except Exception:
+            pass
         loop.close()
 
 
@@ -1,10 +1,12 @@
 MIN_OFFLINE_INTERVAL = 5
 MIN_LIVE_SUMMARY_INTERVAL = 5
 MIN_VIDEO_INTERVAL = 5
+MIN_PROBE_INTERVAL = 5  # seconds
 
 DEFAULT_CONFIG = {
     "discord_token": "",
-    "tiktok_username": "",
+    "tiktok_username": "",  # legacy single creator, migrated into "creators"
+    "creators": [],  # [{"username": str, "intervals": {key: minutes}}]
     "admin_users": ["555790590533697554"],
     "admin_roles": [],
     "maintenance_mode": False,
@@ -24,15 +26,78 @@ DEFAULT_CONFIG = {
         "live_summary": 10,
         "video": 15,
         "retry": 30,   # seconds
+        "probe": 30,   # seconds (cheap live-room check, 0 = off)
         "daily": 60,  # minutes (daily stats save)
+        "snapshot_ttl": 10,  # seconds (shared profile page cache)
     },
 
     "daily_summary": {
         "time_gmt": "23:00",
     },
 
+    "rate_limit": {
+        "rate": 1.0,         # TikTok requests per second (all creators)
+        "burst": 5,
+        "max_wait": 30,      # seconds a request may queue before it's skipped
+        "max_backoff": 900,  # seconds; backoff starts at intervals.retry
+    },
+
+    "live_session": {
+        "sample_interval": 10,  # seconds between samples while live
+        "start_confirmations": 1,  # live samples needed before LIVE START fires
+        "end_confirmations": 3,  # offline samples needed before LIVE END fires
+    },
+
+    "live_summary": {
+        "mode": "post",  # "post" a new message per interval or "edit" one status message per stream
+        "edit_debounce": 30,  # seconds between edits with "edit"
+    },
+
+    "adaptive_polling": {
+        "enabled": False,
+        "daily_budget": 1440,  # live-detection requests per creator per day
+    },
+
+    "scheduler": {
+        "max_concurrency": 4,  # jobs (TikTok fetches) in flight across all creators
+        "jitter": 0.1,  # +-fraction of each interval, spreads creators apart
+        "align": 5,  # seconds; deadlines round up to this so nearby jobs wake together
+    },
+
+    "storage": {
+        "fsync": "interval",  # "always", "interval" or "never"
+        "fsync_interval": 60,  # seconds between fsyncs with "interval"
+        "batch_delay": 2,  # seconds appends are held to be written together
+        "keyframe_every": 60,  # stats journal: full record after this many deltas
+        "archive_after_days": 2,  # day files older than this move to monthly archives
+    },
+
+    "parsing": {
+        "mode": "targeted",  # "targeted" (UserModule only) or "full"
+        "executor": "thread",  # "thread", "process" or "inline"
+        "workers": 1,
+    },
+
+    "http": {
+        "timeout": 20,            # seconds, whole request
+        "connect_timeout": 10,    # seconds
+        "limit_per_host": 4,
+        "dns_cache_ttl": 300,     # seconds
+        "keepalive_timeout": 60,  # seconds
+    },
+
     "disabled_slash_commands": [],
 
+    "slash_sync": {
+        "guilds": [],  # guild ids to sync commands to instead of globally (instant updates)
+    },
+
+    "discord_dispatch": {
+        "max_in_flight": 4,  # Discord sends running at once across channels
+        "max_in_flight_per_guild": 2,  # of those, at most this many for one guild
+        "max_queue": 100,  # queued messages per channel before old low-priority ones drop
+    },
+
     "channels": {
         "live": None,
         "livesummary": None,
@@ -48,4 +113,8 @@ DEFAULT_CONFIG = {
         "videos": None,
         "summary": None,
     },
+
+    # Extra servers notified alongside the channels/roles above:
+    # {"<guild id>": {"channels": {feature: channel id}, "roles": {feature: role id}}}
+    "guilds": {},
 }
@@ -7,8 +7,25 @@ class Paths:
         self.data_dir = self.root / "data"
         self.streams_dir = self.data_dir / "streams"
         self.daily_dir = self.data_dir / "daily"
+        self.live_history_dir = self.data_dir / "live_history"
+        self.timeseries_dir = self.data_dir / "timeseries"
         self.config_file = self.data_dir / "config.json"
+        self.daily_summary_state_file = self.data_dir / "daily_summary_state.json"
+        self.outbox_file = self.data_dir / "outbox.jsonl"
+        self.command_sync_file = self.data_dir / "command_sync.json"
 
         self.data_dir.mkdir(exist_ok=True)
         self.streams_dir.mkdir(exist_ok=True)
         self.daily_dir.mkdir(exist_ok=True)
+        self.live_history_dir.mkdir(exist_ok=True)
+        self.timeseries_dir.mkdir(exist_ok=True)
+
+    def creator_daily_dir(self, username: str) -> Path:
+        path = self.daily_dir / username
+        path.mkdir(exist_ok=True)
+        return path
+
+    def creator_streams_dir(self, username: str) -> Path:
+        path = self.streams_dir / username
+        path.mkdir(exist_ok=True)
+        return path
@@ -1,19 +1,66 @@
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from .defaults import (
     MIN_OFFLINE_INTERVAL,
     MIN_LIVE_SUMMARY_INTERVAL,
     MIN_VIDEO_INTERVAL,
+    MIN_PROBE_INTERVAL,
     DEFAULT_CONFIG,
 )
 
 
+# Lowest allowed value per interval key (same units as config["intervals"])
+_INTERVAL_MINIMUMS = {
+    "offline": MIN_OFFLINE_INTERVAL,
+    "live_summary": MIN_LIVE_SUMMARY_INTERVAL,
+    "video": MIN_VIDEO_INTERVAL,
+    "retry": 1,
+    "probe": MIN_PROBE_INTERVAL,
+    "daily": 1,
+    "snapshot_ttl": 0,
+}
+
+
+def _clamp_interval(key: str, value) -> int:
+    """Apply the interval's minimum; probe also accepts 0 (off)."""
+    value = int(value)
+    if key == "probe" and value <= 0:
+        return 0
+    return max(value, _INTERVAL_MINIMUMS.get(key, 1))
+
+
 def _ensure_section(cfg: Dict, key: str, default: Any) -> Any:
     if key not in cfg or not isinstance(cfg[key], type(default)):
         cfg[key] = default.copy() if isinstance(default, dict) else default
     return cfg[key]
 
 
+def _validate_creators(creators: Any) -> List[Dict]:
+    if not isinstance(creators, list):
+        return []
+
+    result = []
+    seen = set()
+    for entry in creators:
+        if isinstance(entry, str):
+            entry = {"username": entry}
+        if not isinstance(entry, dict):
+            continue
+
+        username = str(entry.get("username") or "").strip().lstrip("@")
+        if not username or username in seen:
+            continue
+        seen.add(username)
+
+        intervals = entry.get("intervals")
+        if not isinstance(intervals, dict):
+            intervals = {}
+        intervals = {k: _clamp_interval(k, v) for k, v in intervals.items() if str(v).isdigit()}
+
+        result.append({"username": username, "intervals": intervals})
+    return result
+
+
 def validate_config(config: Dict) -> Dict:
     cfg = config or {}
 
@@ -21,6 +68,16 @@ def validate_config(config: Dict) -> Dict:
     _ensure_section(cfg, "features", DEFAULT_CONFIG["features"])
     _ensure_section(cfg, "intervals", DEFAULT_CONFIG["intervals"])
     _ensure_section(cfg, "daily_summary", DEFAULT_CONFIG["daily_summary"])
+    _ensure_section(cfg, "http", DEFAULT_CONFIG["http"])
+    _ensure_section(cfg, "parsing", DEFAULT_CONFIG["parsing"])
+    _ensure_section(cfg, "storage", DEFAULT_CONFIG["storage"])
+    _ensure_section(cfg, "scheduler", DEFAULT_CONFIG["scheduler"])
+    _ensure_section(cfg, "rate_limit", DEFAULT_CONFIG["rate_limit"])
+    _ensure_section(cfg, "live_session", DEFAULT_CONFIG["live_session"])
+    _ensure_section(cfg, "live_summary", DEFAULT_CONFIG["live_summary"])
+    _ensure_section(cfg, "adaptive_polling", DEFAULT_CONFIG["adaptive_polling"])
+    _ensure_section(cfg, "discord_dispatch", DEFAULT_CONFIG["discord_dispatch"])
+    _ensure_section(cfg, "slash_sync", DEFAULT_CONFIG["slash_sync"])
     _ensure_section(cfg, "channels", DEFAULT_CONFIG["channels"])
     _ensure_section(cfg, "roles", DEFAULT_CONFIG["roles"])
 
@@ -32,15 +89,87 @@ def validate_config(config: Dict) -> Dict:
     cfg.setdefault("maintenance_mode", False)
     cfg.setdefault("disabled_slash_commands", [])
 
+    # Creators (migrated from the single tiktok_username on first load)
+    if "creators" not in cfg:
+        legacy = str(cfg.get("tiktok_username") or "").strip()
+        cfg["creators"] = [legacy] if legacy else []
+    cfg["creators"] = _validate_creators(cfg["creators"])
+
     # Intervals
     intervals = cfg["intervals"]
-    intervals["offline"] = max(int(intervals.get("offline", 10)), MIN_OFFLINE_INTERVAL)
-    intervals["live_summary"] = max(
-        int(intervals.get("live_summary", 10)), MIN_LIVE_SUMMARY_INTERVAL
-    )
-    intervals["video"] = max(int(intervals.get("video", 15)), MIN_VIDEO_INTERVAL)
-    intervals["retry"] = max(int(intervals.get("retry", 5)), 1)
-    intervals["daily"] = max(int(intervals.get("daily", 60)), 1)
+    for key, default in DEFAULT_CONFIG["intervals"].items():
+        intervals[key] = _clamp_interval(key, intervals.get(key, default))
+
+    # HTTP session
+    http = cfg["http"]
+    http["timeout"] = max(int(http.get("timeout", 20)), 1)
+    http["connect_timeout"] = max(int(http.get("connect_timeout", 10)), 1)
+    http["limit_per_host"] = max(int(http.get("limit_per_host", 4)), 1)
+    http["dns_cache_ttl"] = max(int(http.get("dns_cache_ttl", 300)), 0)
+    http["keepalive_timeout"] = max(int(http.get("keepalive_timeout", 60)), 0)
+
+    # Scheduler
+    scheduler = cfg["scheduler"]
+    scheduler["max_concurrency"] = max(int(scheduler.get("max_concurrency", 4)), 1)
+    scheduler["jitter"] = min(max(float(scheduler.get("jitter", 0.1)), 0.0), 0.5)
+    scheduler["align"] = max(float(scheduler.get("align", 5)), 0.0)
+
+    # Live session
+    live_session = cfg["live_session"]
+    live_session["sample_interval"] = max(int(live_session.get("sample_interval", 10)), 5)
+    live_session["start_confirmations"] = max(int(live_session.get("start_confirmations", 1)), 1)
+    live_session["end_confirmations"] = max(int(live_session.get("end_confirmations", 3)), 1)
+
+    # Live summary
+    live_summary = cfg["live_summary"]
+    if live_summary.get("mode") not in ("post", "edit"):
+        live_summary["mode"] = "post"
+    live_summary["edit_debounce"] = max(float(live_summary.get("edit_debounce", 30)), 5.0)
+
+    # Adaptive polling
+    adaptive = cfg["adaptive_polling"]
+    adaptive["enabled"] = bool(adaptive.get("enabled", False))
+    adaptive["daily_budget"] = max(int(adaptive.get("daily_budget", 1440)), 24)
+
+    # Rate limit
+    rate_limit = cfg["rate_limit"]
+    rate_limit["rate"] = max(float(rate_limit.get("rate", 1.0)), 0.01)
+    rate_limit["burst"] = max(int(rate_limit.get("burst", 5)), 1)
+    rate_limit["max_wait"] = max(int(rate_limit.get("max_wait", 30)), 0)
+    rate_limit["max_backoff"] = max(int(rate_limit.get("max_backoff", 900)), 1)
+
+    # Parsing
+    parsing = cfg["parsing"]
+    if parsing.get("mode") not in ("targeted", "full"):
+        parsing["mode"] = "targeted"
+    if parsing.get("executor") not in ("thread", "process", "inline"):
+        parsing["executor"] = "thread"
+    parsing["workers"] = max(int(parsing.get("workers", 1)), 1)
+
+    # Storage
+    storage = cfg["storage"]
+    if storage.get("fsync") not in ("always", "interval", "never"):
+        storage["fsync"] = "interval"
+    storage["fsync_interval"] = max(float(storage.get("fsync_interval", 60)), 0.0)
+    storage["batch_delay"] = max(float(storage.get("batch_delay", 2)), 0.0)
+    storage["keyframe_every"] = max(int(storage.get("keyframe_every", 60)), 1)
+    storage["archive_after_days"] = max(int(storage.get("archive_after_days", 2)), 1)
+
+    # Discord dispatch
+    dispatch = cfg["discord_dispatch"]
+    dispatch["max_in_flight"] = max(int(dispatch.get("max_in_flight", 4)), 1)
+    dispatch["max_in_flight_per_guild"] = max(int(dispatch.get("max_in_flight_per_guild", 2)), 1)
+    dispatch["max_queue"] = max(int(dispatch.get("max_queue", 100)), 1)
+
+    # Guilds
+    if not isinstance(cfg.get("guilds"), dict):
+        cfg["guilds"] = {}
+    for guild_id, guild in list(cfg["guilds"].items()):
+        if not isinstance(guild, dict):
+            guild = cfg["guilds"][guild_id] = {}
+        for section in ("channels", "roles"):
+            if not isinstance(guild.get(section), dict):
+                guild[section] = {}
 
     # Daily summary
     daily_summary = cfg["daily_summary"]
@@ -50,6 +179,13 @@ def validate_config(config: Dict) -> Dict:
         time_gmt = "23:00"
     daily_summary["time_gmt"] = time_gmt
 
+    # Slash command sync
+    slash_sync = cfg["slash_sync"]
+    guilds = slash_sync.get("guilds")
+    if not isinstance(guilds, list):
+        guilds = []
+    slash_sync["guilds"] = [int(g) for g in guilds if str(g).isdigit()]
+
     # Disabled slash commands
     if not isinstance(cfg["disabled_slash_commands"], list):
         cfg["disabled_slash_commands"] = []
@@ -0,0 +1,87 @@
+import hashlib
+import json
+
+import discord
+
+from utils.logger import log
+
+
+def tree_hash(tree, guild=None) -> str:
+    """Stable hash of the command payloads tree.sync() would upload for one scope."""
+    payload = []
+    for command in tree.get_commands(guild=guild):
+        try:
+            payload.append(command.to_dict(tree))
+        except TypeError:  # discord.py < 2.4
+            payload.append(command.to_dict())
+    payload.sort(key=lambda c: (c.get("type", 1), c["name"]))
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CommandSync:
+    """
+    Uploads the slash command tree only when it changed. The hash of what
+    was last synced is kept per application and scope in
+    data/command_sync.json, so restarts with an unchanged tree skip the
+    slow, rate-limited sync entirely.
+
+    With slash_sync.guilds set, the global commands are copied to those
+    guilds and synced there instead (guild commands update instantly,
+    handy while iterating on commands).
+    """
+
+    def __init__(self, tree, state_path, config=None):
+        self.tree = tree
+        self.state_path = state_path
+        self.config = config if config is not None else {}
+
+    async def sync(self, force: bool = False):
+        app_id = str(self.tree.client.application_id)
+        state = self._load_state()
+        synced = state.setdefault(app_id, {})
+
+        guild_ids = self.config.get("guilds") or []
+        scopes = [discord.Object(id=int(g)) for g in guild_ids] or [None]
+
+        changed = False
+        for guild in scopes:
+            name = "global" if guild is None else str(guild.id)
+            if guild is not None:
+                self.tree.copy_global_to(guild=guild)
+            digest = tree_hash(self.tree, guild)
+            if not force and synced.get(name) == digest:
+                log.info(f"Slash commands unchanged ({name}), skipping sync.")
+                continue
+            try:
+                await self.tree.sync(guild=guild)
+            except Exception as e:
+                # Hash not stored, so the next start tries again
+                log.error(f"Failed to sync slash commands ({name}): {e}")
+                continue
+            synced[name] = digest
+            changed = True
+            log.info(f"Slash commands synced ({name}).")
+
+        if changed:
+            self._save_state(state)
+
+    # ----------------------------------------------------------------------
+    # State
+    # ----------------------------------------------------------------------
+    def _load_state(self):
+        if not self.state_path.exists():
+            return {}
+        try:
+            with self.state_path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            log.error(f"Failed to load command sync state: {e}")
+            return {}
+
+    def _save_state(self, state):
+        try:
+            with self.state_path.open("w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2)
+        except Exception as e:
+            log.error(f"Failed to save command sync state: {e}")
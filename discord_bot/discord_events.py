@@ -6,9 +6,17 @@ from config.feature_flags import FeatureFlags
 from config.paths import Paths
 from utils.logger import log
 from utils.uptime import Uptime
+from .command_sync import CommandSync
+from .dispatcher import Dispatcher, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL
+from .live_status import LiveStatusMessages
+from .outbox import Outbox
 from .slash_commands import setup_slash_commands
 
 
+def _for(username: str, word: str = "for") -> str:
+    return f" {word} @{username}" if username else ""
+
+
 class DiscordBot(discord.Client):
     def __init__(
         self,
@@ -16,10 +24,7 @@ class DiscordBot(discord.Client):
         config_manager: ConfigManager,
         feature_flags: FeatureFlags,
         paths: Paths,
-        polling_engine,
-        live_summary_engine,
-        final_summary_engine,
-        video_upload_engine,
+        creator_registry,
         daily_summary_engine,
         uptime: Uptime,
     ) -> None:
@@ -28,12 +33,20 @@ class DiscordBot(discord.Client):
         self.config_manager = config_manager
         self.feature_flags = feature_flags
         self.paths = paths
-        self.polling_engine = polling_engine
-        self.live_summary_engine = live_summary_engine
-        self.final_summary_engine = final_summary_engine
-        self.video_upload_engine = video_upload_engine
+        self.creator_registry = creator_registry
         self.daily_summary_engine = daily_summary_engine
         self.uptime = uptime
+        storage = config_manager.config.get("storage") or {}
+        self.outbox = Outbox(paths.outbox_file, fsync=storage.get("fsync") != "never")
+        self.dispatcher = Dispatcher(
+            self, config_manager.config.get("discord_dispatch"), outbox=self.outbox
+        )
+        self.command_sync = CommandSync(
+            self.tree, paths.command_sync_file, config_manager.config.get("slash_sync")
+        )
+        self.live_status = LiveStatusMessages(
+            self.dispatcher, config_manager.config.get("live_summary")
+        )
 
     async def setup_hook(self) -> None:
         await setup_slash_commands(
@@ -41,60 +54,137 @@ class DiscordBot(discord.Client):
             client=self,
             config_manager=self.config_manager,
             feature_flags=self.feature_flags,
-            polling_engine=self.polling_engine,
-            live_summary_engine=self.live_summary_engine,
-            final_summary_engine=self.final_summary_engine,
-            video_upload_engine=self.video_upload_engine,
+            creator_registry=self.creator_registry,
             daily_summary_engine=self.daily_summary_engine,
             uptime=self.uptime,
         )
+        # Logged in: the HTTP API is usable, queued messages may go out
+        self.dispatcher.set_ready()
+        # Once per login, and only if the tree changed; reconnects never sync
+        await self.command_sync.sync()
+
+    async def on_resumed(self) -> None:
+        self.dispatcher.resume()
 
     async def on_ready(self) -> None:
         log.info(f"Logged in as {self.user} (ID: {self.user.id})")
-        try:
-            await self.tree.sync()
-            log.info("Slash commands synced.")
-        except Exception as e:
-            log.error(f"Failed to sync slash commands: {e}")
+        self.dispatcher.set_ready()
+        self.dispatcher.resume()
 
-    async def _send(self, feature_name: str, channel_key: str, message: str):
+    async def _send(
+        self,
+        feature_name: str,
+        channel_key: str,
+        message: str,
+        priority: int = PRIORITY_NORMAL,
+        key: str = None,
+        msg_id: str = None,
+    ):
+        """
+        Queue a message for every server with a channel for this feature;
+        returns without waiting for Discord. The default server is queued
+        first, and each target gets its own idempotency id in the outbox.
+        """
+        for guild, channel_id, role_id in self._targets(feature_name, channel_key):
+            content = f"<@&{role_id}> {message}" if role_id else message
+            self.dispatcher.enqueue(
+                channel_id,
+                content,
+                priority,
+                f"{key}:{channel_id}" if key else None,
+                f"{msg_id}:{channel_id}" if msg_id else None,
+                guild,
+            )
+
+    def _targets(self, feature_name: str, channel_key: str):
+        """
+        [(guild, channel id, role id)] for a feature: the top-level
+        channels/roles (guild None) first, then each entry in "guilds".
+        Empty if the feature is disabled.
+        """
         cfg = self.config_manager.config
 
         if not cfg.get("features", {}).get(feature_name, False):
-            return
-
-        channel_id = cfg.get("channels", {}).get(channel_key)
-        if not channel_id:
+            return []
+
+        scopes = [(None, cfg)] + list(cfg.get("guilds", {}).items())
+        targets, seen = [], set()
+        for guild, scope in scopes:
+            channel_id = (scope.get("channels") or {}).get(channel_key)
+            if not channel_id or int(channel_id) in seen:
+                continue
+            seen.add(int(channel_id))
+            role_id = (scope.get("roles") or {}).get(channel_key)
+            targets.append((guild, int(channel_id), role_id))
+
+        if not targets:
             log.error(f"{feature_name} enabled but no channel set for '{channel_key}'.")
-            return
-
-        channel = self.get_channel(int(channel_id))
-        if not channel:
-            log.error(f"Channel {channel_id} not found for {feature_name}.")
-            return
+        return targets
 
-        try:
-            await channel.send(message)
-        except Exception as e:
-            log.error(f"Failed to send {feature_name}: {e}")
+    @property
+    def edits_live_status(self) -> bool:
+        return (self.config_manager.config.get("live_summary") or {}).get("mode") == "edit"
 
     # ---- Notification types (aligned with config.json) ----
 
-    async def send_live_notification(self, stats=None):
-        await self._send("live_notifications", "live", "🔴 **The streamer is LIVE on TikTok!**")
+    async def send_live_notification(self, stats=None, username: str = None):
+        who = f"@{username}" if username else "The streamer"
+        room_id = (stats or {}).get("room_id")
+        await self._send(
+            "live_notifications",
+            "live",
+            f"🔴 **{who} is LIVE on TikTok!**",
+            PRIORITY_HIGH,
+            msg_id=f"live:{username}:{room_id}" if room_id else None,
+        )
 
-    async def send_live_summary(self, summary_text: str):
-        await self._send("livesummary", "livesummary", f"📊 **Live Summary:**\n{summary_text}")
+    async def send_live_summary(self, summary_text: str, username: str = None):
+        if self.edits_live_status:
+            return  # the live status message carries the stats instead
+        # A newer summary replaces one still waiting in the queue
+        await self._send(
+            "livesummary",
+            "livesummary",
+            f"📊 **Live Summary{_for(username)}:**\n{summary_text}",
+            PRIORITY_LOW,
+            key=f"livesummary:{username}",
+        )
 
-    async def send_final_summary(self, summary_text: str):
-        await self._send("finalsummary", "finalsummary", f"📘 **Final Summary:**\n{summary_text}")
+    async def update_live_status(self, stats, username: str, started_at: float):
+        """Refresh the stream's live status message (live_summary.mode "edit")."""
+        if not self.edits_live_status:
+            return
+        for guild, channel_id, _ in self._targets("livesummary", "livesummary"):
+            self.live_status.update(username, channel_id, stats, started_at, guild)
+
+    async def finish_live_status(self, summary, username: str):
+        self.live_status.finish(username, summary)
+
+    async def send_final_summary(self, summary_text: str, username: str = None, msg_id: str = None):
+        await self._send(
+            "finalsummary",
+            "finalsummary",
+            f"📘 **Final Summary{_for(username)}:**\n{summary_text}",
+            msg_id=msg_id,
+        )
 
-    async def send_new_video(self, video_id: str):
-        await self._send("video_notifications", "videos", f"🎥 **New TikTok video posted!**\nID: `{video_id}`")
+    async def send_new_video(self, video_id: str, username: str = None):
+        await self._send(
+            "video_notifications",
+            "videos",
+            f"🎥 **New TikTok video posted{_for(username, 'by')}!**\nID: `{video_id}`",
+            msg_id=f"video:{username}:{video_id}",
+        )
 
-    async def send_daily_summary(self, summary_text: str):
+    async def send_daily_summary(self, summary_text: str, username: str = None, msg_id: str = None):
         # your config uses "daily_summary" feature and "summary" channel
-        await self._send("daily_summary", "summary", f"🗓️ **Daily Summary:**\n{summary_text}")
+        await self._send(
+            "daily_summary",
+            "summary",
+            f"🗓️ **Daily Summary{_for(username)}:**\n{summary_text}",
+            PRIORITY_LOW,
+            msg_id=msg_id,
+        )
 
     async def send_battery_warning(self, pct: int):
-        await self._send("battery_warnings", "battery", f"⚠️ **Battery low:** {pct}%")
+        await self._send("battery_warnings", "battery", f"⚠️ **Battery low:** {pct}%", key="battery")
@@ -0,0 +1,446 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+import uuid
+from collections import deque
+
+import discord
+
+from utils.logger import log
+
+
+# Priority lanes, drained in this order
+PRIORITY_HIGH = 0    # LIVE pings
+PRIORITY_NORMAL = 1  # videos, final summaries, warnings
+PRIORITY_LOW = 2     # periodic live summaries, daily summaries
+LANES = (PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW)
+
+# Discord allows about 5 messages per 5 seconds per channel
+CHANNEL_BURST = 5
+CHANNEL_PER = 5.0  # seconds
+
+MAX_MESSAGE_LEN = 2000
+
+# Backoff for sends that fail on outages (network, 5xx): doubles per failure
+RETRY_BASE = 15    # seconds
+RETRY_MAX = 600    # seconds
+# Errors that retrying won't fix (bad request, no access, unknown channel)
+PERMANENT_STATUSES = (400, 403, 404)
+
+
+class OutboundMessage:
+    def __init__(
+        self,
+        channel_id: int,
+        content: str,
+        priority: int,
+        key: str = None,
+        msg_id: str = None,
+        guild: str = None,
+    ):
+        self.channel_id = channel_id
+        self.content = content
+        self.priority = priority
+        self.key = key  # a newer queued message with the same key replaces this one
+        self.msg_id = msg_id  # idempotency id in the outbox
+        self.guild = guild  # configured guild the channel belongs to (None = default server)
+        self.enqueued_at = time.monotonic()
+
+
+class _Gate:
+    """
+    Counting semaphore that hands free slots out by priority, then in
+    arrival order. The last slot is kept for reserved acquirers: a send
+    holds its slot while discord.py sleeps through a 429, so without the
+    reserve a few rate-limited channels could hold every slot.
+    """
+
+    def __init__(self, limit_fn):
+        self.limit_fn = limit_fn  # read on every wake-up, so config changes apply live
+        self.active = 0
+        self._waiters = []  # heap of ((reserved first, priority), seq, reserved, future)
+        self._seq = itertools.count()
+
+    def _fits(self, reserved: bool) -> bool:
+        limit = self.limit_fn()
+        return self.active < (limit if reserved else max(limit - 1, 1))
+
+    async def acquire(self, priority: int, reserved: bool = False):
+        rank = (0 if reserved else 1, priority)
+        if self._fits(reserved) and (not self._waiters or self._waiters[0][0] > rank):
+            self.active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (rank, next(self._seq), reserved, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # got the slot just as we were cancelled
+            raise
+
+    def release(self):
+        self.active -= 1
+        while self._waiters:
+            _, _, reserved, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._fits(reserved):
+                break
+            heapq.heappop(self._waiters)
+            self.active += 1
+            future.set_result(None)
+
+
+class _ChannelQueue:
+    def __init__(self, channel_id: int, guild: str = None):
+        self.channel_id = channel_id
+        self.guild = guild
+        self.lanes = {lane: deque() for lane in LANES}
+        self.tokens = float(CHANNEL_BURST)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.failures = 0
+        self.wake = asyncio.Event()
+
+    def __len__(self):
+        return sum(len(lane) for lane in self.lanes.values())
+
+    async def take_token(self):
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                # resume() wakes us early once Discord is reachable again
+                self.wake.clear()
+                try:
+                    await asyncio.wait_for(self.wake.wait(), self.blocked_until - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.tokens = min(
+                float(CHANNEL_BURST),
+                self.tokens + (now - self.updated) * CHANNEL_BURST / CHANNEL_PER,
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) * CHANNEL_PER / CHANNEL_BURST)
+
+    def pop_batch(self):
+        """Head of the highest-priority lane plus whatever queued behind it fits in one message."""
+        lane = next(self.lanes[p] for p in LANES if self.lanes[p])
+        batch = [lane.popleft()]
+        size = len(batch[0].content)
+        while lane and size + 2 + len(lane[0].content) <= MAX_MESSAGE_LEN:
+            size += 2 + len(lane[0].content)
+            batch.append(lane.popleft())
+        return batch
+
+
+class Dispatcher:
+    """
+    Owns every outbound Discord message. enqueue() never blocks: messages
+    go into per-channel queues with three priority lanes and are sent by
+    one worker per busy channel, which respects that channel's rate
+    bucket. At most max_in_flight sends run at once across channels and
+    at most max_in_flight_per_guild per configured guild, so a slow or
+    backed-off guild can't hold every slot. Free slots go to the highest
+    priority waiting, then first come first served, and one slot stays
+    reserved for LIVE pings to the default server, so fan-out to other
+    guilds (even ones stuck in rate limits) never delays that ping.
+
+    Bursts are coalesced: messages queued behind each other in the same
+    lane go out as one message (up to Discord's 2000 characters), and a
+    keyed message replaces an older queued one with the same key (e.g.
+    a stale live summary). Each channel holds at most max_queue messages;
+    beyond that the oldest lowest-priority message is dropped.
+
+    With an Outbox, every message is journaled before it is queued and
+    marked done once Discord accepted it (or it was replaced, dropped or
+    rejected for good). Sends that fail on an outage stay queued and
+    retry with backoff; replay() re-queues what a previous run left
+    undelivered and resume() retries at once after a reconnect.
+    """
+
+    def __init__(self, client: discord.Client, config=None, outbox=None):
+        self.client = client
+        self.config = config if config is not None else {}
+        self.outbox = outbox
+        self._queues = {}
+        self._workers = {}
+        self._channels = {}  # resolved channel objects
+        self._queued_ids = set()  # msg_ids queued or in flight
+        # Set once the client has logged in. Messages are queued before that
+        # (outbox replay, early LIVE pings) and wait here rather than on
+        # client.wait_until_ready(), which raises until login() has run.
+        self._ready = asyncio.Event()
+        self._in_flight = _Gate(lambda: self.max_in_flight)
+        self._guild_in_flight = {}  # guild -> _Gate
+
+        # Metrics
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.replaced = 0
+        self.latency_avg = 0.0  # seconds, enqueue -> sent (EWMA)
+        self.latency_max = 0.0
+
+    # ----------------------------------------------------------------------
+    # Settings (read live from config)
+    # ----------------------------------------------------------------------
+    @property
+    def max_in_flight(self) -> int:
+        return int(self.config.get("max_in_flight", 4))
+
+    @property
+    def max_in_flight_per_guild(self) -> int:
+        return int(self.config.get("max_in_flight_per_guild", 2))
+
+    @property
+    def max_queue(self) -> int:
+        return int(self.config.get("max_queue", 100))
+
+    # ----------------------------------------------------------------------
+    # Public
+    # ----------------------------------------------------------------------
+    def enqueue(
+        self,
+        channel_id: int,
+        content: str,
+        priority: int = PRIORITY_NORMAL,
+        key: str = None,
+        msg_id: str = None,
+        guild: str = None,
+    ):
+        content = content[:MAX_MESSAGE_LEN]
+        if self.outbox:
+            msg_id = msg_id or uuid.uuid4().hex
+            if self.outbox.seen(msg_id):
+                return  # already queued or delivered
+            self.outbox.add(msg_id, channel_id, content, priority, key, guild)
+        self._enqueue(OutboundMessage(channel_id, content, priority, key, msg_id, guild))
+
+    async def call(self, channel_id: int, func, priority: int = PRIORITY_LOW, guild: str = None):
+        """
+        Run func(channel) for a request whose result is needed (e.g. a
+        message to edit later) under the channel's rate bucket and the
+        in-flight limits. Not journaled or retried; errors propagate.
+        """
+        queue = self._queue(channel_id, guild)
+        await self._ready.wait()
+        await queue.take_token()
+        async with self._slot(queue, priority):
+            try:
+                return await func(await self._resolve(channel_id))
+            except discord.HTTPException as e:
+                if e.status == 429:
+                    queue.blocked_until = time.monotonic() + (getattr(e, "retry_after", None) or CHANNEL_PER)
+                raise
+
+    async def replay(self):
+        """Queue what the previous run left undelivered, then compact the outbox."""
+        if not self.outbox:
+            return
+        for entry in self.outbox.take_recovered():
+            self._enqueue(
+                OutboundMessage(
+                    entry["ch"], entry["content"], entry["p"], entry.get("k"), entry["id"], entry.get("g")
+                )
+            )
+        await self.outbox.compact()
+
+    def set_ready(self):
+        """The client is logged in: queued messages can go out."""
+        self._ready.set()
+
+    def resume(self):
+        """Connection is back: retry backed-off channels now."""
+        for queue in self._queues.values():
+            if queue.failures:
+                queue.failures = 0
+                queue.blocked_until = 0.0
+                queue.wake.set()
+            if len(queue):
+                self._ensure_worker(queue)
+
+    def get_metrics(self):
+        by_guild = {}
+        for q in self._queues.values():
+            if len(q):
+                guild = q.guild or "default"
+                by_guild[guild] = by_guild.get(guild, 0) + len(q)
+        return {
+            "queued": sum(len(q) for q in self._queues.values()),
+            "queued_by_channel": {cid: len(q) for cid, q in self._queues.items() if len(q)},
+            "queued_by_guild": by_guild,
+            "workers": len(self._workers),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "outbox_pending": len(self.outbox.pending) if self.outbox else 0,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "replaced": self.replaced,
+            "latency_avg_s": round(self.latency_avg, 3),
+            "latency_max_s": round(self.latency_max, 3),
+        }
+
+    def stop(self):
+        for task in list(self._workers.values()):
+            task.cancel()
+        self._workers.clear()
+        if self.outbox:
+            self.outbox.close()
+
+    # ----------------------------------------------------------------------
+    # Internal
+    # ----------------------------------------------------------------------
+    def _queue(self, channel_id: int, guild: str = None) -> _ChannelQueue:
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = self._queues[channel_id] = _ChannelQueue(channel_id, guild)
+        return queue
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, queue: _ChannelQueue, priority: int):
+        """
+        One in-flight slot for the queue's guild, then one overall. LIVE
+        pings may use each guild's reserved slot, and LIVE pings to the
+        default server the reserved overall slot, so other guilds' stalled
+        sends can't delay them.
+        """
+        high = priority == PRIORITY_HIGH
+        guild_gate = self._guild_in_flight.get(queue.guild)
+        if guild_gate is None:
+            guild_gate = self._guild_in_flight[queue.guild] = _Gate(lambda: self.max_in_flight_per_guild)
+        await guild_gate.acquire(priority, reserved=high)
+        try:
+            await self._in_flight.acquire(priority, reserved=high and queue.guild is None)
+            try:
+                yield
+            finally:
+                self._in_flight.release()
+        finally:
+            guild_gate.release()
+
+    def _enqueue(self, message: OutboundMessage):
+        if message.msg_id is not None:
+            if message.msg_id in self._queued_ids:
+                return
+            self._queued_ids.add(message.msg_id)
+        queue = self._queue(message.channel_id, message.guild)
+
+        lane = queue.lanes[message.priority]
+        if message.key is not None:
+            for i, queued in enumerate(lane):
+                if queued.key == message.key:
+                    message.enqueued_at = queued.enqueued_at
+                    lane[i] = message
+                    self.replaced += 1
+                    self._finish([queued])
+                    self._ensure_worker(queue)
+                    return
+
+        lane.append(message)
+        if len(queue) > self.max_queue:
+            self._drop_one(queue)
+        self._ensure_worker(queue)
+
+    def _finish(self, messages):
+        self._queued_ids.difference_update(m.msg_id for m in messages)
+        if self.outbox:
+            self.outbox.done([m.msg_id for m in messages if m.msg_id])
+
+    def _drop_one(self, queue: _ChannelQueue):
+        for lane in reversed(LANES):
+            if queue.lanes[lane]:
+                self._finish([queue.lanes[lane].popleft()])
+                self.dropped += 1
+                log.warning(f"Discord queue for channel {queue.channel_id} full, dropped a message.")
+                return
+
+    def _ensure_worker(self, queue: _ChannelQueue):
+        if queue.channel_id not in self._workers:
+            self._workers[queue.channel_id] = asyncio.create_task(self._drain(queue))
+
+    async def _resolve(self, channel_id: int):
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            channel = self.client.get_channel(channel_id)
+            if channel is None:
+                channel = await self.client.fetch_channel(channel_id)
+            self._channels[channel_id] = channel
+        return channel
+
+    async def _drain(self, queue: _ChannelQueue):
+        try:
+            await self._ready.wait()
+            while len(queue):
+                await queue.take_token()
+                if not len(queue):
+                    break
+                priority = next(p for p in LANES if queue.lanes[p])
+                async with self._slot(queue, priority):
+                    if not len(queue):
+                        break
+                    batch = queue.pop_batch()
+                    await self._send_batch(queue, batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error(f"Discord worker for channel {queue.channel_id} stopped: {e}")
+        finally:
+            self._workers.pop(queue.channel_id, None)
+
+    async def _send_batch(self, queue: _ChannelQueue, batch):
+        content = "\n\n".join(m.content for m in batch)
+        try:
+            channel = await self._resolve(queue.channel_id)
+            await channel.send(content)
+        except discord.HTTPException as e:
+            if e.status == 429:
+                # Put it back in front and wait out the bucket
+                queue.lanes[batch[0].priority].extendleft(reversed(batch))
+                retry_after = getattr(e, "retry_after", None) or CHANNEL_PER
+                queue.blocked_until = time.monotonic() + retry_after
+                log.warning(f"Discord rate limited channel {queue.channel_id}, retrying in {retry_after:.0f}s.")
+                return
+            self._channels.pop(queue.channel_id, None)
+            if e.status in PERMANENT_STATUSES:
+                self.failed += len(batch)
+                self._finish(batch)
+                log.error(f"Discord rejected message for channel {queue.channel_id}, dropping it: {e}")
+                return
+            self._retry_later(queue, batch, e)
+            return
+        except Exception as e:
+            self._channels.pop(queue.channel_id, None)
+            self._retry_later(queue, batch, e)
+            return
+
+        queue.failures = 0
+        self._finish(batch)
+        now = time.monotonic()
+        self.sent += len(batch)
+        self.coalesced += len(batch) - 1
+        for m in batch:
+            latency = now - m.enqueued_at
+            self.latency_avg = latency if self.sent == len(batch) else 0.9 * self.latency_avg + 0.1 * latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def _retry_later(self, queue: _ChannelQueue, batch, error):
+        """Outage (network, 5xx): keep the messages and back off this channel."""
+        queue.lanes[batch[0].priority].extendleft(reversed(batch))
+        queue.failures += 1
+        delay = min(RETRY_MAX, RETRY_BASE * 2 ** (queue.failures - 1))
+        queue.blocked_until = time.monotonic() + delay
+        self.retried += len(batch)
+        log.warning(
+            f"Failed to send to channel {queue.channel_id} ({error}), retrying in {delay:.0f}s."
+        )
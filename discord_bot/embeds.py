@@ -9,3 +9,33 @@ def basic_status_embed(tiktok_username: str, maintenance: bool) -> discord.Embed
     )
     e.add_field(name="Maintenance", value=str(maintenance))
     return e
+
+
+def live_status_embed(username: str, stats, started_at: float, peak_viewers: int) -> discord.Embed:
+    """The in-place live status message, edited while the stream runs."""
+    e = discord.Embed(
+        title=f"🔴 @{username} is LIVE",
+        description=stats.get("title") or "TikTok LIVE",
+        url=f"https://www.tiktok.com/@{username}/live",
+        color=discord.Color.red(),
+    )
+    e.add_field(name="Viewers", value=f"{int(stats.get('viewer_count') or 0):,}")
+    e.add_field(name="Peak", value=f"{peak_viewers:,}")
+    # Rendered relative by Discord clients, so it stays current without edits
+    e.add_field(name="Started", value=f"<t:{int(started_at)}:R>")
+    return e
+
+
+def live_ended_embed(username: str, summary) -> discord.Embed:
+    """Final state of the live status message once the stream ended."""
+    e = discord.Embed(
+        title=f"⚫ @{username} was live",
+        description=(summary or {}).get("title") or "Stream ended",
+        color=discord.Color.dark_grey(),
+    )
+    if summary:
+        e.add_field(name="Duration", value=f"{summary['duration_minutes']} min")
+        e.add_field(name="Peak", value=f"{summary['peak_viewers']:,}")
+        e.add_field(name="Avg viewers", value=f"{summary['avg_viewers']:,}")
+        e.add_field(name="Ended", value=f"<t:{int(summary['ended_at'])}:R>")
+    return e
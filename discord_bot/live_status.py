@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import discord
+
+from utils.logger import log
+from .embeds import live_ended_embed, live_status_embed
+
+
+class _StreamStatus:
+    def __init__(self, channel_id: int, started_at: float, guild: str = None):
+        self.channel_id = channel_id
+        self.guild = guild
+        self.started_at = started_at
+        self.message = None     # the posted discord.Message
+        self.latest = None      # newest stats, not necessarily shown yet
+        self.peak = 0
+        self.shown = None       # signature of what the message shows
+        self.last_edit = 0.0
+        self.task = None        # pending flush
+        self.busy = False       # a request to Discord is running
+
+
+class LiveStatusMessages:
+    """
+    One Discord message per live stream and channel, edited in place with fresh stats
+    instead of a new post every live_summary interval (live_summary.mode
+    "edit"). update() never blocks: it stores the newest stats and makes
+    sure a flush is pending. Flushes are at least edit_debounce seconds
+    apart, and a flush whose viewers/title match what the message already
+    shows makes no API call. finish() turns the message into the ended
+    state once the stream is over.
+    """
+
+    def __init__(self, dispatcher, config=None):
+        self.dispatcher = dispatcher
+        self.config = config if config is not None else {}
+        self._streams = {}  # (username, channel id) -> _StreamStatus
+
+        # Metrics
+        self.edits = 0
+        self.skipped = 0
+
+    @property
+    def debounce(self) -> float:
+        return float(self.config.get("edit_debounce", 30))
+
+    # ----------------------------------------------------------------------
+    # Public
+    # ----------------------------------------------------------------------
+    def update(self, username: str, channel_id: int, stats, started_at: float, guild: str = None):
+        status = self._streams.get((username, channel_id))
+        if status is None or status.started_at != started_at:
+            status = self._streams[(username, channel_id)] = _StreamStatus(channel_id, started_at, guild)
+        status.latest = stats
+        status.peak = max(status.peak, int(stats.get("viewer_count") or 0))
+        if status.task is None or status.task.done():
+            status.task = asyncio.create_task(self._flush(username, status))
+
+    def finish(self, username: str, summary):
+        for key in [k for k in self._streams if k[0] == username]:
+            asyncio.create_task(self._finalize(username, self._streams.pop(key), summary))
+
+    def stop(self):
+        for status in self._streams.values():
+            if status.task:
+                status.task.cancel()
+        self._streams.clear()
+
+    # ----------------------------------------------------------------------
+    # Internal
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _signature(stats):
+        return int(stats.get("viewer_count") or 0), stats.get("title")
+
+    async def _flush(self, username: str, status: _StreamStatus):
+        wait = status.last_edit + self.debounce - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        stats = status.latest
+        signature = self._signature(stats)
+        if signature == status.shown:
+            self.skipped += 1
+            return
+
+        embed = live_status_embed(username, stats, status.started_at, status.peak)
+        status.busy = True
+        try:
+            if status.message is None:
+                status.message = await self.dispatcher.call(
+                    status.channel_id, lambda channel: channel.send(embed=embed), guild=status.guild
+                )
+            else:
+                await self.dispatcher.call(
+                    status.channel_id, lambda channel: status.message.edit(embed=embed), guild=status.guild
+                )
+                self.edits += 1
+            status.shown = signature
+        except discord.NotFound:
+            status.message = None  # deleted by someone, post a new one next time
+        except Exception as e:
+            log.error(f"Failed to update live status for @{username}: {e}")
+        finally:
+            status.busy = False
+            status.last_edit = time.monotonic()
+
+    async def _finalize(self, username: str, status: _StreamStatus, summary):
+        if status.task and not status.task.done():
+            if status.busy:
+                await asyncio.wait([status.task])  # let the post land so it can be edited
+            else:
+                status.task.cancel()
+        if status.message is None:
+            return
+
+        embed = live_ended_embed(username, summary)
+        try:
+            await self.dispatcher.call(
+                status.channel_id, lambda channel: status.message.edit(embed=embed), guild=status.guild
+            )
+        except Exception as e:
+            log.error(f"Failed to finalise live status for @{username}: {e}")
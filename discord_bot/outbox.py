@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from utils.async_writer import run_io
+from utils.logger import log
+
+
+# Delivered ids remembered (and kept through compaction) to drop duplicates
+REMEMBER_DELIVERED = 2000
+# Rewrite the file once this many entries were delivered since the last rewrite
+COMPACT_AFTER = 500
+
+
+class Outbox:
+    """
+    Append-only journal of outbound Discord messages (data/outbox.jsonl)
+    giving at-least-once delivery across restarts and outages:
+
+        {"op": "add", "id": .., "ch": .., "content": .., "p": .., "k": .., "g": .., "ts": ..}
+        {"op": "done", "ids": [..]}
+
+    Every message has an idempotency id. Adding an id that is pending or
+    was recently delivered is a no-op, so a LIVE ping re-detected after
+    a restart or a retried send isn't posted twice. Appends are handed
+    to the shared I/O thread without being awaited; callers never wait
+    on the disk. Delivered entries are dropped by compact().
+
+    The journal is read when the Outbox is created, before any engine can
+    queue a message, so ids from the previous run are known from the start.
+    """
+
+    def __init__(self, path, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self.pending = {}  # id -> entry, in insertion order
+        self._delivered = deque(maxlen=REMEMBER_DELIVERED)
+        self._delivered_set = set()
+        self._done_since_compact = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._recovered = self.load()
+
+    # ----------------------------------------------------------------------
+    # Public
+    # ----------------------------------------------------------------------
+    def load(self):
+        """Read the journal; returns the entries still waiting for delivery."""
+        if not self.path.exists():
+            return []
+
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn last line
+                if record.get("op") == "add":
+                    self.pending[record["id"]] = record
+                elif record.get("op") == "done":
+                    for msg_id in record.get("ids", []):
+                        self.pending.pop(msg_id, None)
+                        self._remember(msg_id)
+
+        if self.pending:
+            log.info(f"Outbox has {len(self.pending)} undelivered message(s) to replay.")
+        return list(self.pending.values())
+
+    def take_recovered(self):
+        """Entries the previous run left undelivered (once; later calls return [])."""
+        recovered = [e for e in self._recovered if e["id"] in self.pending]
+        self._recovered = []
+        return recovered
+
+    def seen(self, msg_id: str) -> bool:
+        return msg_id in self.pending or msg_id in self._delivered_set
+
+    def add(
+        self, msg_id: str, channel_id: int, content: str, priority: int, key: str = None, guild: str = None
+    ):
+        entry = {
+            "op": "add",
+            "id": msg_id,
+            "ch": channel_id,
+            "content": content,
+            "p": priority,
+            "k": key,
+            "g": guild,
+            "ts": round(time.time(), 1),
+        }
+        self.pending[msg_id] = entry
+        self._submit(entry)
+
+    def done(self, msg_ids):
+        msg_ids = [i for i in msg_ids if i in self.pending]
+        if not msg_ids:
+            return
+        for msg_id in msg_ids:
+            self.pending.pop(msg_id, None)
+            self._remember(msg_id)
+        self._done_since_compact += len(msg_ids)
+        self._submit({"op": "done", "ids": msg_ids})
+
+        if self._done_since_compact >= COMPACT_AFTER:
+            self._done_since_compact = 0
+            self._schedule(self._rewrite, list(self.pending.values()), list(self._delivered))
+
+    async def compact(self):
+        self._done_since_compact = 0
+        await run_io(self._rewrite, list(self.pending.values()), list(self._delivered))
+
+    def close(self):
+        with self._lock:
+            self._close_file()
+
+    # ----------------------------------------------------------------------
+    # Internal
+    # ----------------------------------------------------------------------
+    def _remember(self, msg_id: str):
+        if msg_id in self._delivered_set:
+            return
+        if len(self._delivered) == self._delivered.maxlen:
+            self._delivered_set.discard(self._delivered[0])
+        self._delivered.append(msg_id)
+        self._delivered_set.add(msg_id)
+
+    def _submit(self, record):
+        self._schedule(self._append, json.dumps(record, ensure_ascii=False))
+
+    def _schedule(self, func, *args):
+        future = asyncio.ensure_future(run_io(func, *args))
+        future.add_done_callback(self._log_failure)
+
+    @staticmethod
+    def _log_failure(future):
+        if not future.cancelled() and future.exception():
+            log.error(f"Outbox write failed: {future.exception()}")
+
+    def _append(self, line: str):
+        with self._lock:
+            if self._file is None:
+                self._file = self.path.open("a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def _rewrite(self, pending, delivered):
+        """Replace the journal with just the pending entries and remembered ids."""
+        tmp = self.path.with_suffix(".tmp")
+        with self._lock:
+            self._close_file()
+            with tmp.open("w", encoding="utf-8") as f:
+                if delivered:
+                    f.write(json.dumps({"op": "done", "ids": delivered}) + "\n")
+                for entry in pending:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+    def _close_file(self):
+        if self._file:
+            self._file.close()
+            self._file = None
@@ -15,6 +15,7 @@ from config.defaults import (
 from discord_bot.permissions import is_admin
 from discord_bot.admin_roles import add_admin_role, remove_admin_role
 from utils.logger import log
+from utils.time_utils import parse_hhmm
 
 
 def _is_disabled(config, name: str) -> bool:
@@ -26,10 +27,7 @@ async def setup_slash_commands(
     client: discord.Client,
     config_manager: ConfigManager,
     feature_flags: FeatureFlags,
-    polling_engine,
-    live_summary_engine,
-    final_summary_engine,
-    video_upload_engine,
+    creator_registry,
     daily_summary_engine,
     uptime,
 ):
@@ -56,6 +54,11 @@ async def setup_slash_commands(
 
         return wrapper
 
+    def _scope(interaction: discord.Interaction):
+        """The guild's own entry in "guilds" if it has one, else the top-level config."""
+        guild = cfg.get("guilds", {}).get(str(interaction.guild_id))
+        return guild if guild is not None else cfg
+
     class AdminGroup(app_commands.Group, name="admin"):
         pass
 
@@ -102,9 +105,9 @@ async def setup_slash_commands(
         if not await guard(interaction, "status"):
             return
         maint = cfg.get("maintenance_mode", False)
-        ttu = cfg.get("tiktok_username", "") or "<not set>"
+        creators = ", ".join(f"@{u}" for u in creator_registry.usernames()) or "<not set>"
         await interaction.response.send_message(
-            f"Bot is running.\nMaintenance: {maint}\nTikTok: @{ttu}",
+            f"Bot is running.\nMaintenance: {maint}\nTikTok: {creators}",
             ephemeral=True,
         )
 
@@ -119,15 +122,58 @@ async def setup_slash_commands(
             f"Maintenance mode set to {enabled}.", ephemeral=True
         )
 
-    @tree.command(name="settiktok", description="Set TikTok username")
+    @tree.command(
+        name="settiktok",
+        description="Set the monitored TikTok creators (space-separated usernames)",
+    )
     @admin_only
-    async def settiktok_cmd(interaction: discord.Interaction, username: str):
+    async def settiktok_cmd(interaction: discord.Interaction, usernames: str):
         if not await guard(interaction, "settiktok"):
             return
-        cfg["tiktok_username"] = username
+        creator_registry.set_creators(usernames.replace(",", " ").split())
+        config_manager.save_config()
+        creators = ", ".join(f"@{u}" for u in creator_registry.usernames()) or "<none>"
+        await interaction.response.send_message(
+            f"Monitored TikTok creators: {creators}.", ephemeral=True
+        )
+
+    @tree.command(name="addcreator", description="Start monitoring a TikTok creator")
+    @admin_only
+    async def addcreator_cmd(interaction: discord.Interaction, username: str):
+        if not await guard(interaction, "addcreator"):
+            return
+        if not creator_registry.add(username):
+            await interaction.response.send_message(
+                f"@{username.lstrip('@')} is already monitored.", ephemeral=True
+            )
+            return
+        config_manager.save_config()
+        await interaction.response.send_message(
+            f"Now monitoring @{username.lstrip('@')}.", ephemeral=True
+        )
+
+    @tree.command(name="removecreator", description="Stop monitoring a TikTok creator")
+    @admin_only
+    async def removecreator_cmd(interaction: discord.Interaction, username: str):
+        if not await guard(interaction, "removecreator"):
+            return
+        if not creator_registry.remove(username):
+            await interaction.response.send_message(
+                f"@{username.lstrip('@')} is not monitored.", ephemeral=True
+            )
+            return
         config_manager.save_config()
         await interaction.response.send_message(
-            f"TikTok username set to @{username}.", ephemeral=True
+            f"Stopped monitoring @{username.lstrip('@')}.", ephemeral=True
+        )
+
+    @tree.command(name="creators", description="List monitored TikTok creators")
+    async def creators_cmd(interaction: discord.Interaction):
+        if not await guard(interaction, "creators"):
+            return
+        creators = "\n".join(f"@{u}" for u in creator_registry.usernames()) or "<none>"
+        await interaction.response.send_message(
+            f"Monitored TikTok creators:\n{creators}", ephemeral=True
         )
 
     @tree.command(
@@ -145,6 +191,7 @@ async def setup_slash_commands(
             return
         cfg["intervals"]["offline"] = minutes
         config_manager.save_config()
+        creator_registry.scheduler.refresh()
         await interaction.response.send_message(
             f"Offline interval set to {minutes} minutes.", ephemeral=True
         )
@@ -167,6 +214,7 @@ async def setup_slash_commands(
             return
         cfg["intervals"]["live_summary"] = minutes
         config_manager.save_config()
+        creator_registry.scheduler.refresh()
         await interaction.response.send_message(
             f"Live summary interval set to {minutes} minutes.", ephemeral=True
         )
@@ -186,6 +234,7 @@ async def setup_slash_commands(
             return
         cfg["intervals"]["video"] = minutes
         config_manager.save_config()
+        creator_registry.scheduler.refresh()
         await interaction.response.send_message(
             f"Video interval set to {minutes} minutes.", ephemeral=True
         )
@@ -202,6 +251,7 @@ async def setup_slash_commands(
             return
         cfg["intervals"]["daily"] = minutes
         config_manager.save_config()
+        creator_registry.scheduler.refresh()
         await interaction.response.send_message(
             f"Daily save interval set to {minutes} minutes.", ephemeral=True
         )
@@ -216,8 +266,14 @@ async def setup_slash_commands(
     ):
         if not await guard(interaction, "setdailysummarytime"):
             return
+        if parse_hhmm(time_str) != time_str:
+            await interaction.response.send_message(
+                "Time must be HH:MM (24h, GMT).", ephemeral=True
+            )
+            return
         cfg.setdefault("daily_summary", {})["time_gmt"] = time_str
         config_manager.save_config()
+        daily_summary_engine.reschedule()
         await interaction.response.send_message(
             f"Daily summary time set to {time_str} GMT.", ephemeral=True
         )
@@ -246,7 +302,7 @@ async def setup_slash_commands(
     ):
         if not await guard(interaction, "setchannel"):
             return
-        cfg["channels"][feature_name] = channel.id
+        _scope(interaction)["channels"][feature_name] = channel.id
         config_manager.save_config()
         await interaction.response.send_message(
             f"Channel for `{feature_name}` set to {channel.mention}.",
@@ -262,11 +318,39 @@ async def setup_slash_commands(
     ):
         if not await guard(interaction, "setrole"):
             return
-        cfg["roles"][feature_name] = role.id
+        _scope(interaction)["roles"][feature_name] = role.id
         config_manager.save_config()
         await interaction.response.send_message(
             f"Role for `{feature_name}` set to {role.mention}.",
             ephemeral=True,
         )
 
-    log.info("Slash commands registered (sync will happen in on_ready).")
+    @tree.command(name="addguild", description="Notify this server with its own channels and roles")
+    @admin_only
+    async def addguild_cmd(interaction: discord.Interaction):
+        if not await guard(interaction, "addguild"):
+            return
+        if interaction.guild_id is None:
+            await interaction.response.send_message("Run this in a server.", ephemeral=True)
+            return
+        cfg.setdefault("guilds", {}).setdefault(
+            str(interaction.guild_id), {"channels": {}, "roles": {}}
+        )
+        config_manager.save_config()
+        await interaction.response.send_message(
+            "Server added. Set its channels with /setchannel and roles with /setrole.",
+            ephemeral=True,
+        )
+
+    @tree.command(name="removeguild", description="Stop notifying this server")
+    @admin_only
+    async def removeguild_cmd(interaction: discord.Interaction):
+        if not await guard(interaction, "removeguild"):
+            return
+        if cfg.get("guilds", {}).pop(str(interaction.guild_id), None) is None:
+            await interaction.response.send_message("This server isn't added.", ephemeral=True)
+            return
+        config_manager.save_config()
+        await interaction.response.send_message("Server removed.", ephemeral=True)
+
+    log.info("Slash commands registered (synced in setup_hook if changed).")
@@ -56,10 +56,7 @@ class MainApp(App):
         self,
         config_manager: ConfigManager,
         feature_flags: FeatureFlags,
-        polling_engine,
-        live_summary_engine,
-        final_summary_engine,
-        video_upload_engine,
+        creator_registry,
         daily_summary_engine,
         log_window,
         system_monitor=None,
@@ -68,10 +65,7 @@ class MainApp(App):
         super().__init__(**kwargs)
         self.cfg_mgr = config_manager
         self.feature_flags = feature_flags
-        self.polling_engine = polling_engine
-        self.live_summary_engine = live_summary_engine
-        self.final_summary_engine = final_summary_engine
-        self.video_upload_engine = video_upload_engine
+        self.creator_registry = creator_registry
         self.daily_summary_engine = daily_summary_engine
         self.log_window = log_window
         self.system_monitor = system_monitor
@@ -104,10 +98,7 @@ class MainApp(App):
             content.mount(
                 EnginesView(
                     self.cfg_mgr,
-                    self.polling_engine,
-                    self.live_summary_engine,
-                    self.final_summary_engine,
-                    self.video_upload_engine,
+                    self.creator_registry,
                     self.daily_summary_engine,
                 )
             )
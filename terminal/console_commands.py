@@ -1,10 +1,16 @@
+import time
+from datetime import datetime, timedelta
+
 from config.config_manager import ConfigManager
 from config.defaults import (
     MIN_OFFLINE_INTERVAL,
     MIN_LIVE_SUMMARY_INTERVAL,
     MIN_VIDEO_INTERVAL,
+    MIN_PROBE_INTERVAL,
 )
 from utils.logger import log
+from utils.timeseries import TS_FIELDS
+from utils.time_utils import parse_hhmm
 
 
 class ConsoleCommands:
@@ -12,24 +18,20 @@ class ConsoleCommands:
         self,
         config_manager: ConfigManager,
         feature_flags,
-        polling_engine,
-        live_summary_engine,
-        final_summary_engine,
-        video_upload_engine,
+        creator_registry,
         daily_summary_engine,
         uptime,
         log_window,
+        dispatcher=None,
         app=None,
     ):
         self.cfg_mgr = config_manager
         self.feature_flags = feature_flags
-        self.polling_engine = polling_engine
-        self.live_summary_engine = live_summary_engine
-        self.final_summary_engine = final_summary_engine
-        self.video_upload_engine = video_upload_engine
+        self.creator_registry = creator_registry
         self.daily_summary_engine = daily_summary_engine
         self.uptime = uptime
         self.log_window = log_window
+        self.dispatcher = dispatcher
         self.app = app
 
     def _set_interval(self, key: str, value: int, minimum: int | None = None) -> str:
@@ -38,8 +40,22 @@ class ConsoleCommands:
                 f"Warning: {key} below recommended minimum ({minimum})."
             )
         self.cfg_mgr.config.setdefault("intervals", {})[key] = value
+        self.creator_registry.scheduler.refresh()
         return f"Interval '{key}' set to {value} (not saved yet)."
 
+    def _history_rows(self, creator, days: int):
+        """First and last snapshot of the last N days, from the time series if there is one."""
+        end = time.time()
+        start = end - days * 86400
+        if creator.timeseries.path.exists():
+            with creator.timeseries.reader() as reader:
+                first, stop = reader.span(start, end)
+                if stop > first:
+                    return [dict(zip(TS_FIELDS, reader[i])) for i in (first, stop - 1)]
+
+        end_dt = datetime.utcnow()
+        return creator.stats_history.query(end_dt - timedelta(days=days), end_dt)
+
     def handle(self, cmd: str) -> str:
         cmd = cmd.strip()
         if not cmd:
@@ -69,6 +85,10 @@ class ConsoleCommands:
                 "  roles                     - list feature roles\n"
                 "  setchannel <feature> <id> - set channel for feature\n"
                 "  setrole <feature> <id>    - set role for feature\n"
+                "  guilds                    - list extra servers and their channels\n"
+                "  guild add/remove <id>     - add or remove an extra server\n"
+                "  guild setchannel <guild> <feature> <id> - set a server's channel\n"
+                "  guild setrole <guild> <feature> <id>    - set a server's role\n"
                 "\n"
                 "=== FEATURES & MAINTENANCE ===\n"
                 "  features                  - list feature flags\n"
@@ -76,13 +96,21 @@ class ConsoleCommands:
                 "  maintenance on/off        - toggle maintenance mode\n"
                 "\n"
                 "=== TIKTOK SETTINGS ===\n"
-                "  settiktok <username>      - set TikTok username\n"
+                "  settiktok <user> [user..] - set monitored TikTok creators\n"
+                "  creators                  - list monitored creators\n"
+                "  creator add <username>    - start monitoring a creator\n"
+                "  creator remove <username> - stop monitoring a creator\n"
+                "  ratelimit                 - show TikTok request budget\n"
+                "  jobs                      - show scheduled jobs and next run\n"
+                "  dispatch                  - show Discord send queue metrics\n"
+                "  history <user> [days]     - follower/like change over N days\n"
                 "\n"
                 "=== INTERVALS ===\n"
                 "  interval offline N        - set offline interval (min)\n"
                 "  interval live N           - set live summary interval (min)\n"
                 "  interval video N          - set video interval (min)\n"
                 "  interval retry N          - set TikTok retry interval (sec)\n"
+                "  interval probe N          - set live probe interval (sec, 0=off)\n"
                 "  interval daily N          - set daily stats save interval (min)\n"
                 "  dailytime HH:MM           - set daily summary time (GMT)\n"
                 "\n"
@@ -103,8 +131,12 @@ class ConsoleCommands:
         # ---------------------------------------------------------
         if name == "status":
             cfg = self.cfg_mgr.config
+            creators = ", ".join(f"@{u}" for u in self.creator_registry.usernames())
+            parse = self.creator_registry.transport.get_parse_stats()
             return (
-                f"TikTok username: @{cfg.get('tiktok_username', '') or '<not set>'}\n"
+                f"TikTok creators: {creators or '<not set>'}\n"
+                f"Profile parsing: {parse['count']} page(s), last {parse['last_ms']} ms, "
+                f"avg {parse['avg_ms']} ms\n"
                 f"Intervals: {cfg.get('intervals', {})}\n"
                 f"Daily time (GMT): {cfg.get('daily_summary', {}).get('time_gmt', '23:00')}\n"
                 f"Maintenance: {cfg.get('maintenance_mode', False)}\n"
@@ -148,12 +180,64 @@ class ConsoleCommands:
             return f"Maintenance mode set to {enabled} (not saved yet)."
 
         # ---------------------------------------------------------
-        # SET TIKTOK USERNAME
+        # TIKTOK CREATORS
         # ---------------------------------------------------------
-        if name == "settiktok" and len(args) == 1:
-            username = args[0]
-            self.cfg_mgr.config["tiktok_username"] = username
-            return f"TikTok username set to @{username} (not saved yet)."
+        if name == "settiktok" and len(args) >= 1:
+            self.creator_registry.set_creators(args)
+            creators = ", ".join(f"@{u}" for u in self.creator_registry.usernames())
+            return f"Monitored TikTok creators: {creators} (not saved yet)."
+
+        if name == "creators":
+            creators = self.creator_registry.usernames()
+            if not creators:
+                return "No creators monitored."
+            return "\n".join(f"@{u}" for u in creators)
+
+        if name == "creator" and len(args) == 2:
+            sub, username = args[0].lower(), args[1].lstrip("@")
+            if sub == "add":
+                if not self.creator_registry.add(username):
+                    return f"@{username} is already monitored."
+                return f"Now monitoring @{username} (not saved yet)."
+            if sub == "remove":
+                if not self.creator_registry.remove(username):
+                    return f"@{username} is not monitored."
+                return f"Stopped monitoring @{username} (not saved yet)."
+            return "Usage: creator <add|remove> <username>"
+
+        if name == "ratelimit":
+            metrics = self.creator_registry.transport.rate_limiter.get_metrics()
+            return "\n".join(f"{k}: {v}" for k, v in metrics.items())
+
+        if name == "history" and args:
+            creator = self.creator_registry.get(args[0])
+            if not creator:
+                return f"@{args[0]} is not monitored."
+            days = int(args[1]) if len(args) > 1 and args[1].isdigit() else 7
+            rows = self._history_rows(creator, days)
+            if not rows:
+                return f"No stats recorded for @{creator.username} in the last {days} day(s)."
+            first, last = rows[0], rows[-1]
+            return (
+                f"@{creator.username}, last {days} day(s):\n"
+                f"followers {last['followers']:,} ({last['followers'] - first['followers']:+,})\n"
+                f"likes {last['likes']:,} ({last['likes'] - first['likes']:+,})"
+            )
+
+        if name == "dispatch":
+            if not self.dispatcher:
+                return "Discord dispatcher not available."
+            metrics = self.dispatcher.get_metrics()
+            return "\n".join(f"{k}: {v}" for k, v in metrics.items())
+
+        if name == "jobs":
+            rows = self.creator_registry.scheduler.describe()
+            if not rows:
+                return "No scheduled jobs."
+            return "\n".join(
+                f"{key:<32} {'running' if running else f'in {due:.0f}s'} (every {interval:.0f}s)"
+                for key, due, interval, running in rows
+            )
 
         # ---------------------------------------------------------
         # INTERVALS
@@ -161,7 +245,7 @@ class ConsoleCommands:
         if name == "interval" and len(args) == 2:
             which, val = args
             if not val.isdigit():
-                return "Usage: interval <offline|live|video|retry|daily> <value>"
+                return "Usage: interval <offline|live|video|retry|probe|daily> <value>"
             n = int(val)
             if which == "offline":
                 return self._set_interval("offline", n, MIN_OFFLINE_INTERVAL)
@@ -171,16 +255,21 @@ class ConsoleCommands:
                 return self._set_interval("video", n, MIN_VIDEO_INTERVAL)
             if which == "retry":
                 return self._set_interval("retry", n, None)
+            if which == "probe":
+                return self._set_interval("probe", n, MIN_PROBE_INTERVAL if n else None)
             if which == "daily":
                 return self._set_interval("daily", n, None)
-            return "Unknown interval type. Use offline/live/video/retry/daily."
+            return "Unknown interval type. Use offline/live/video/retry/probe/daily."
 
         # ---------------------------------------------------------
         # DAILY SUMMARY TIME
         # ---------------------------------------------------------
         if name == "dailytime" and len(args) == 1:
             time_str = args[0]
+            if parse_hhmm(time_str) != time_str:
+                return "Usage: dailytime HH:MM (24h, GMT)"
             self.cfg_mgr.config.setdefault("daily_summary", {})["time_gmt"] = time_str
+            self.daily_summary_engine.reschedule()
             return f"Daily summary time set to {time_str} GMT (not saved yet)."
 
         # ---------------------------------------------------------
@@ -249,6 +338,47 @@ class ConsoleCommands:
             self.cfg_mgr.config.setdefault("roles", {})[feature] = int(role_id)
             return f"Role for '{feature}' set to {role_id} (not saved yet)."
 
+        # ---------------------------------------------------------
+        # EXTRA SERVERS (GUILDS)
+        # ---------------------------------------------------------
+        if name == "guilds":
+            guilds = self.cfg_mgr.config.setdefault("guilds", {})
+            if not guilds:
+                return "No extra servers configured."
+            lines = []
+            for guild_id, guild in guilds.items():
+                lines.append(f"{guild_id}:")
+                lines.extend(f"  channel {k}: {v}" for k, v in guild.get("channels", {}).items())
+                lines.extend(f"  role {k}: {v}" for k, v in guild.get("roles", {}).items())
+            return "\n".join(lines)
+
+        if name == "guild" and len(args) >= 2:
+            sub, guild_id = args[0].lower(), args[1]
+            if not guild_id.isdigit():
+                return "Guild ID must be numeric."
+            guilds = self.cfg_mgr.config.setdefault("guilds", {})
+
+            if sub == "add":
+                guilds.setdefault(guild_id, {"channels": {}, "roles": {}})
+                return f"Added server {guild_id} (not saved yet)."
+
+            if sub == "remove":
+                if guilds.pop(guild_id, None) is None:
+                    return f"Server {guild_id} is not configured."
+                return f"Removed server {guild_id} (not saved yet)."
+
+            if sub in ("setchannel", "setrole") and len(args) == 4:
+                feature, target_id = args[2], args[3]
+                if guild_id not in guilds:
+                    return f"Server {guild_id} is not configured. Use: guild add {guild_id}"
+                if not target_id.isdigit():
+                    return "ID must be numeric."
+                section = "channels" if sub == "setchannel" else "roles"
+                guilds[guild_id].setdefault(section, {})[feature] = int(target_id)
+                return f"{section[:-1].capitalize()} for '{feature}' in {guild_id} set to {target_id} (not saved yet)."
+
+            return "Usage: guild <add|remove> <guild> | guild <setchannel|setrole> <guild> <feature> <id>"
+
         # ---------------------------------------------------------
         # SLASH COMMAND VISIBILITY
         # ---------------------------------------------------------
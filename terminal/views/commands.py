@@ -13,11 +13,19 @@ class CommandsView(Static):
             "  features                  - list feature flags\n"
             "  feature <name> on/off     - toggle feature\n"
             "  maintenance on/off        - toggle maintenance mode\n"
-            "  settiktok <username>      - set TikTok username\n"
+            "  settiktok <user> [user..] - set monitored TikTok creators\n"
+            "  creators                  - list monitored creators\n"
+            "  creator add <username>    - start monitoring a creator\n"
+            "  creator remove <username> - stop monitoring a creator\n"
+            "  ratelimit                 - show TikTok request budget\n"
+            "  jobs                      - show scheduled jobs and next run\n"
+            "  dispatch                  - show Discord send queue metrics\n"
+            "  history <user> [days]     - follower/like change over N days\n"
             "  interval offline N        - set offline interval (min)\n"
             "  interval live N           - set live summary interval (min)\n"
             "  interval video N          - set video interval (min)\n"
             "  interval retry N          - set TikTok retry interval (sec)\n"
+            "  interval probe N          - set live probe interval (sec, 0=off)\n"
             "  interval daily N          - set daily stats save interval (min)\n"
             "  dailytime HH:MM           - set daily summary time (GMT)\n"
             "  slash disable <cmd>       - hide a slash command\n"
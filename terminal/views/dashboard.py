@@ -20,7 +20,7 @@ class DashboardView(Static):
 
     def compose(self) -> ComposeResult:
         cfg = self.cfg_mgr.config
-        ttu = cfg.get("tiktok_username", "") or "<not set>"
+        creators = ", ".join(f"@{c['username']}" for c in cfg.get("creators", []))
         maint = cfg.get("maintenance_mode", False)
         intervals = cfg.get("intervals", {})
 
@@ -35,13 +35,14 @@ class DashboardView(Static):
 
         text = (
             "Dashboard\n\n"
-            f"TikTok: @{ttu}\n"
+            f"TikTok: {creators or '<not set>'}\n"
             f"Maintenance: {maint}\n\n"
             "Intervals:\n"
             f"  offline:      {intervals.get('offline')}\n"
             f"  live_summary: {intervals.get('live_summary')}\n"
             f"  video:        {intervals.get('video')}\n"
             f"  retry:        {intervals.get('retry')}\n"
+            f"  probe:        {intervals.get('probe')}\n"
             f"  daily:        {intervals.get('daily')}\n\n"
             f"Daily summary time (GMT): {cfg.get('daily_summary', {}).get('time_gmt', '23:00')}\n\n"
             "System Stats:\n"
@@ -8,30 +8,29 @@ class EnginesView(Static):
     def __init__(
         self,
         cfg_mgr: ConfigManager,
-        polling_engine,
-        live_summary_engine,
-        final_summary_engine,
-        video_upload_engine,
+        creator_registry,
         daily_summary_engine,
         **kwargs,
     ):
         super().__init__(**kwargs)
         self.cfg_mgr = cfg_mgr
-        self.polling_engine = polling_engine
-        self.live_summary_engine = live_summary_engine
-        self.final_summary_engine = final_summary_engine
-        self.video_upload_engine = video_upload_engine
+        self.creator_registry = creator_registry
         self.daily_summary_engine = daily_summary_engine
 
     def compose(self) -> ComposeResult:
-        text = (
-            "Engines\n\n"
-            "PollingEngine:        running\n"
-            "LiveSummaryEngine:    running\n"
-            "FinalSummaryEngine:   running\n"
-            "VideoUploadEngine:    running\n"
-            "DailySaveEngine:      running\n"
-            "DailySummaryEngine:   running\n"
-            "\n(Replace with real status wiring later.)"
-        )
-        yield Static(text)
+        lines = ["Engines", ""]
+        for username, creator in self.creator_registry.creators.items():
+            lines.append(f"@{username:<24} {creator.live_session.state}")
+        if not self.creator_registry.creators:
+            lines.append("No creators monitored.")
+
+        daily = "running" if self.daily_summary_engine.running else "stopped"
+        lines.append("")
+        lines.append(f"DailySummaryEngine:   {daily}")
+
+        lines.append("")
+        lines.append("Next runs")
+        for key, due, interval, running in self.creator_registry.scheduler.describe():
+            when = "running" if running else f"in {due:.0f}s"
+            lines.append(f"{key:<32} {when}")
+        yield Static("\n".join(lines))
@@ -0,0 +1,342 @@
+import asyncio
+import re
+from datetime import datetime
+
+from config.defaults import MIN_PROBE_INTERVAL
+from tiktok.live_history import LiveHistory
+from tiktok.tiktok_api import TikTokAPI
+from tiktok.live_session import LiveSession
+from tiktok.polling_engine import PollingEngine
+from tiktok.stats_archive import StatsHistory, compact_daily_dir
+from tiktok.stream_recorder import StreamRecorder
+from tiktok.final_summary_engine import FinalSummaryEngine
+from tiktok.video_upload_engine import VideoUploadEngine
+from tiktok.daily_save_engine import DailySaveEngine
+from utils.async_writer import run_io
+from utils.logger import log
+
+
+# How often a creator with probing disabled checks whether it was re-enabled
+PROBE_DISABLED_RECHECK = 300  # seconds
+# Share of the TikTok request rate that all creators' probes together may use
+PROBE_BUDGET_SHARE = 0.5
+# How often closed day files are rolled into the monthly archives
+COMPACT_INTERVAL = 6 * 3600  # seconds
+# Day files written straight into data/daily/ before creators had their own dirs
+LEGACY_DAY_FILE = re.compile(r"\d{4}-\d{2}-\d{2}\.json")
+
+
+def normalize_username(username: str) -> str:
+    return str(username or "").strip().lstrip("@")
+
+
+class Creator:
+    """
+    Everything the bot tracks for one TikTok creator: its API handle (on
+    the shared transport), its live session and its video and daily-stats
+    engines.
+    The periodic engines are driven by the Scheduler through their
+    tick() methods rather than by loops of their own.
+    """
+
+    def __init__(
+        self,
+        cfg_mgr,
+        entry,
+        transport,
+        scheduler,
+        daily_dir,
+        streams_dir,
+        history_path,
+        timeseries_path,
+    ):
+        self.cfg_mgr = cfg_mgr
+        self.entry = entry  # this creator's dict inside config["creators"]
+        self.username = entry["username"]
+        self.daily_dir = daily_dir
+        self.streams_dir = streams_dir
+        self.history = LiveHistory(history_path)
+
+        intervals = cfg_mgr.config["intervals"]
+        self.api = TikTokAPI(
+            self.username,
+            retry_interval=intervals["retry"],
+            snapshot_ttl=intervals["snapshot_ttl"],
+            transport=transport,
+        )
+
+        self.recorder = StreamRecorder(streams_dir, self.username)
+        self.final_summary_engine = FinalSummaryEngine(cfg_mgr, self.api)
+        self.live_session = LiveSession(
+            cfg_mgr,
+            self.api,
+            scheduler,
+            self.interval,
+            history=self.history,
+            recorder=self.recorder,
+            final_summary=self.final_summary_engine,
+        )
+        self.polling_engine = PollingEngine(cfg_mgr, self.api, self.live_session)
+        self.video_upload_engine = VideoUploadEngine(cfg_mgr, self.api)
+        self.daily_save_engine = DailySaveEngine(cfg_mgr, self.api, daily_dir, timeseries_path)
+        self.timeseries = self.daily_save_engine.timeseries
+        self.stats_history = StatsHistory(daily_dir)
+
+    def interval(self, key: str):
+        """Per-creator override from config, falling back to the global interval."""
+        overrides = self.entry.get("intervals") or {}
+        return overrides.get(key, self.cfg_mgr.config["intervals"][key])
+
+    def adaptive_interval(self):
+        """
+        Seconds until the next live-detection request under the learned
+        schedule, or None when adaptive polling is off.
+        """
+        adaptive = self.cfg_mgr.config.get("adaptive_polling") or {}
+        if not adaptive.get("enabled"):
+            return None
+        return self.history.interval_for(
+            datetime.utcnow(), adaptive["daily_budget"], MIN_PROBE_INTERVAL
+        )
+
+    def probe_interval(self):
+        if self.interval("probe") <= 0:
+            return PROBE_DISABLED_RECHECK
+        return self.adaptive_interval() or self.interval("probe")
+
+    def poll_interval(self):
+        # Without probes the full poll is the live detector, so it follows the schedule
+        if self.interval("probe") <= 0:
+            adaptive = self.adaptive_interval()
+            if adaptive:
+                return adaptive
+        return self.interval("offline") * 60
+
+    async def compact(self):
+        keep_days = self.cfg_mgr.config["storage"]["archive_after_days"]
+        await run_io(compact_daily_dir, self.daily_dir, keep_days)
+
+    def stop(self):
+        for engine in (
+            self.polling_engine,
+            self.live_session,
+            self.video_upload_engine,
+            self.daily_save_engine,
+        ):
+            try:
+                engine.stop()
+            except Exception:
+                pass
+
+    async def close(self):
+        """stop() plus closing the daily files once what's queued is written."""
+        self.stop()
+        await self.daily_save_engine.close()
+
+
+class CreatorRegistry:
+    """
+    Owns the monitored creators and keeps config["creators"], the Creator
+    objects and the scheduler's jobs in step. on_creator_added is called
+    with each new Creator so the orchestrator can wire its callbacks.
+    """
+
+    def __init__(self, cfg_mgr, paths, transport, scheduler):
+        self.cfg_mgr = cfg_mgr
+        self.paths = paths
+        self.transport = transport
+        self.scheduler = scheduler
+        self.creators = {}
+        self._closing = set()  # removed creators whose files are still being closed
+        self.on_creator_added = None  # callback(creator)
+
+    def load(self):
+        self._migrate_legacy_daily()
+        for entry in self.cfg_mgr.config.get("creators", []):
+            self._start(entry)
+
+    def usernames(self):
+        return list(self.creators)
+
+    def get(self, username: str):
+        return self.creators.get(normalize_username(username))
+
+    # ----------------------------------------------------------------------
+    # Add / remove
+    # ----------------------------------------------------------------------
+    def add(self, username: str) -> bool:
+        username = normalize_username(username)
+        if not username or username in self.creators:
+            return False
+
+        entry = {"username": username, "intervals": {}}
+        self.cfg_mgr.config.setdefault("creators", []).append(entry)
+        self._start(entry)
+        log.info(f"Now monitoring @{username}.")
+        return True
+
+    def remove(self, username: str) -> bool:
+        username = normalize_username(username)
+        creator = self.creators.pop(username, None)
+        if not creator:
+            return False
+
+        self.scheduler.remove_owner(username)
+        creator.stop()
+        self._close_later(creator)
+
+        cfg = self.cfg_mgr.config
+        cfg["creators"] = [e for e in cfg.get("creators", []) if e["username"] != username]
+        log.info(f"Stopped monitoring @{username}.")
+        return True
+
+    def set_creators(self, usernames):
+        wanted = [normalize_username(u) for u in usernames if normalize_username(u)]
+        for username in self.usernames():
+            if username not in wanted:
+                self.remove(username)
+        for username in wanted:
+            self.add(username)
+
+    def stop(self):
+        for creator in self.creators.values():
+            creator.stop()
+
+    async def close(self):
+        """Close every creator's files (shutdown), including ones just removed."""
+        for creator in list(self.creators.values()) + list(self._closing):
+            try:
+                await creator.close()
+            except Exception as e:
+                log.error(f"Failed to close files of @{creator.username}: {e}")
+        self._closing.clear()
+
+    # ----------------------------------------------------------------------
+    # Internal
+    # ----------------------------------------------------------------------
+    def _probe_interval(self, creator):
+        """The creator's probe interval, stretched so all probes stay within their budget share."""
+        interval = creator.probe_interval()
+        if creator.interval("probe") <= 0:
+            return interval
+        probing = sum(1 for c in self.creators.values() if c.interval("probe") > 0)
+        share = self.transport.rate_limiter.max_rate * PROBE_BUDGET_SHARE
+        return max(interval, probing / share)
+
+    def _close_later(self, creator):
+        self._closing.add(creator)
+        task = asyncio.ensure_future(creator.close())
+
+        def done(task):
+            if task.cancelled():
+                return  # close() at shutdown picks it up
+            self._closing.discard(creator)
+            if task.exception():
+                log.error(f"Failed to close files of @{creator.username}: {task.exception()}")
+
+        task.add_done_callback(done)
+
+    def _migrate_legacy_daily(self):
+        """
+        One-time move of the flat data/daily/YYYY-MM-DD.json files (single
+        creator era) into the directory of the creator they belong to: the
+        legacy tiktok_username if it is still monitored, else the first one.
+        """
+        legacy = [p for p in self.paths.daily_dir.iterdir() if LEGACY_DAY_FILE.fullmatch(p.name)]
+        creators = [e["username"] for e in self.cfg_mgr.config.get("creators", [])]
+        if not legacy or not creators:
+            return
+
+        owner = normalize_username(self.cfg_mgr.config.get("tiktok_username") or "")
+        if owner not in creators:
+            owner = creators[0]
+        target_dir = self.paths.creator_daily_dir(owner)
+
+        for path in sorted(legacy):
+            target = target_dir / path.name
+            try:
+                if target.exists():
+                    # Same day written in both places: older lines go first
+                    older = path.read_bytes()
+                    if older and not older.endswith(b"\n"):
+                        older += b"\n"
+                    merged = older + target.read_bytes()
+                    tmp = target.with_suffix(".tmp")
+                    tmp.write_bytes(merged)
+                    tmp.replace(target)
+                    path.unlink()
+                else:
+                    path.replace(target)
+            except OSError as e:
+                log.error(f"Failed to migrate {path.name} to @{owner}: {e}")
+        log.info(f"Moved {len(legacy)} legacy daily file(s) to @{owner}.")
+
+    def _start(self, entry) -> Creator:
+        daily_dir = self.paths.creator_daily_dir(entry["username"])
+        streams_dir = self.paths.creator_streams_dir(entry["username"])
+        history_path = self.paths.live_history_dir / f"{entry['username']}.json"
+        timeseries_path = self.paths.timeseries_dir / f"{entry['username']}.ts"
+        creator = Creator(
+            self.cfg_mgr,
+            entry,
+            self.transport,
+            self.scheduler,
+            daily_dir,
+            streams_dir,
+            history_path,
+            timeseries_path,
+        )
+        self.creators[creator.username] = creator
+
+        if self.on_creator_added:
+            self.on_creator_added(creator)
+
+        owner = creator.username
+        creator.polling_engine.start()
+        creator.video_upload_engine.start()
+        creator.daily_save_engine.start()
+
+        async def probe():
+            if creator.interval("probe") > 0:
+                await creator.polling_engine.probe()
+
+        # TikTok jobs wait for the shared request budget before taking a slot
+        budget = self.transport.rate_limiter.wait_time
+
+        # Probe every few seconds; the full poll is the slow safety net
+        self.scheduler.add_job(
+            f"{owner}:probe",
+            probe,
+            lambda: self._probe_interval(creator),
+            owner=owner,
+            budget=budget,
+        )
+        self.scheduler.add_job(
+            f"{owner}:poll",
+            creator.polling_engine.tick,
+            creator.poll_interval,
+            owner=owner,
+            budget=budget,
+        )
+        self.scheduler.add_job(
+            f"{owner}:video",
+            creator.video_upload_engine.tick,
+            lambda: creator.interval("video") * 60,
+            owner=owner,
+            budget=budget,
+        )
+        self.scheduler.add_job(
+            f"{owner}:daily_save",
+            creator.daily_save_engine.tick,
+            lambda: creator.interval("daily") * 60,
+            owner=owner,
+            budget=budget,
+        )
+        self.scheduler.add_job(
+            f"{owner}:compact",
+            creator.compact,
+            lambda: COMPACT_INTERVAL,
+            owner=owner,
+            delay=60,
+        )
+        return creator
@@ -1,34 +1,71 @@
-import asyncio
-import json
-from datetime import datetime
+from datetime import datetime, timezone
+from tiktok.stats_journal import StatsJournal
+from utils.async_writer import run_io
+from utils.json_store import JsonlWriter
+from utils.timeseries import TimeSeriesStore
 from utils.logger import log
 
 
 class DailySaveEngine:
-    def __init__(self, cfg_mgr, tiktok_client, daily_dir, interval_minutes: int):
+    def __init__(self, cfg_mgr, tiktok_client, daily_dir, timeseries_path):
         self.cfg_mgr = cfg_mgr
         self.client = tiktok_client
         self.daily_dir = daily_dir
-        self.interval = interval_minutes
         self.running = False
+        self._last_saved = None  # (date, snapshot_version) of the last stats journaled
 
-    async def start(self):
+        storage = cfg_mgr.config.get("storage") or {}
+        self.writer = JsonlWriter(
+            lambda date: self.daily_dir / f"{date}.json",
+            fsync=storage.get("fsync", "interval"),
+            fsync_interval=storage.get("fsync_interval", 60),
+            batch_delay=storage.get("batch_delay", 2),
+        )
+        self.journal = StatsJournal(self.writer, storage.get("keyframe_every", 60))
+        # Fixed-width copy of every change for fast range reports
+        self.timeseries = TimeSeriesStore(timeseries_path)
+
+    def start(self):
         self.running = True
-        log.info("DailySaveEngine started.")
 
-        while self.running:
-            stats = await self.client.fetch_profile_stats()
-            if stats:
-                date = datetime.utcnow().strftime("%Y-%m-%d")
-                path = self.daily_dir / f"{date}.json"
+    async def tick(self):
+        if not self.running:
+            return
+
+        stats = await self.client.fetch_profile_stats()
+        now = datetime.utcnow()
+
+        if stats is None:
+            # The failure marker breaks the run, so the next good poll is
+            # journaled even if the page didn't change
+            self._last_saved = None
+        else:
+            # Unchanged page since the last save today: nothing new to journal
+            saved = (now.strftime("%Y-%m-%d"), self.client.snapshot_version)
+            if saved == self._last_saved:
+                return
+            self._last_saved = saved
 
-                try:
-                    with path.open("a", encoding="utf-8") as f:
-                        f.write(json.dumps(stats) + "\n")
-                except Exception as e:
-                    log.error(f"Failed to save daily stats: {e}")
+        # Keyframes/deltas/failure markers, queued and written off the event loop
+        written = self.journal.record(stats, now)
 
-            await asyncio.sleep(self.interval * 60)
+        if written and stats is not None:
+            try:
+                await run_io(
+                    self.timeseries.append,
+                    now.replace(tzinfo=timezone.utc).timestamp(), stats["followers"], stats["likes"], stats["views"],
+                )
+            except Exception as e:
+                log.error(f"Failed to append stats time series: {e}")
+
+    async def flush(self):
+        await self.writer.flush()
 
     def stop(self):
         self.running = False
+
+    async def close(self):
+        """Write what the journal still holds and close the files, off the event loop."""
+        self.stop()
+        await self.writer.close()
+        await run_io(self.timeseries.close)
@@ -1,63 +1,148 @@
-import asyncio
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
+from tiktok.stats_journal import read_first_state, read_last_state
 from utils.logger import log
+from utils.time_utils import parse_hhmm
 
 
 class DailySummaryEngine:
-    def __init__(self, cfg_mgr, daily_dir):
+    """
+    Posts each creator's daily summary once per day at
+    daily_summary.time_gmt. It runs as a deadline job on the scheduler,
+    so it sleeps straight until the next summary time instead of polling
+    the clock. The date of the last summary is stored in
+    daily_summary_state.json; after a restart, a deadline missed during
+    the downtime is caught up immediately, and it is never sent twice.
+    """
+
+    JOB_KEY = "daily_summary"
+
+    def __init__(self, cfg_mgr, creator_registry, state_path):
         self.cfg_mgr = cfg_mgr
-        self.daily_dir = daily_dir
+        self.creator_registry = creator_registry
+        self.state_path = state_path
         self.running = False
         self.on_daily_summary = None  # callback
+        self.last_fired = None  # "YYYY-MM-DD" of the last deadline summarised
+        self._load_state()
 
-    async def start(self):
+    # ----------------------------------------------------------------------
+    # Scheduling
+    # ----------------------------------------------------------------------
+    def start(self):
         self.running = True
-        log.info("DailySummaryEngine started.")
+        self.creator_registry.scheduler.add_job(
+            self.JOB_KEY,
+            self.tick,
+            self.seconds_until_next,
+            delay=self.seconds_until_next(),
+            deadline=True,
+        )
+        log.info(f"DailySummaryEngine started, next summary in {self.seconds_until_next() / 3600:.1f}h.")
 
-        while self.running:
-            now = datetime.utcnow().strftime("%H:%M")
-            target = self.cfg_mgr.config["daily_summary"]["time_gmt"]
+    def stop(self):
+        self.running = False
+        self.creator_registry.scheduler.remove_job(self.JOB_KEY)
 
-            if now == target:
-                await self.generate_summary()
+    def reschedule(self):
+        """Call after daily_summary.time_gmt changes."""
+        self.creator_registry.scheduler.refresh()
 
-            await asyncio.sleep(30)
+    def _latest_deadline(self, now: datetime) -> datetime:
+        """The most recent summary time at or before now."""
+        hh, mm = parse_hhmm(self.cfg_mgr.config["daily_summary"]["time_gmt"]).split(":")
+        deadline = now.replace(hour=int(hh), minute=int(mm), second=0, microsecond=0)
+        if deadline > now:
+            deadline -= timedelta(days=1)
+        return deadline
 
-    def stop(self):
-        self.running = False
+    def _pending(self, now: datetime):
+        """The missed deadline that still needs a summary, or None."""
+        deadline = self._latest_deadline(now)
+        if self.last_fired is None or deadline.strftime("%Y-%m-%d") > self.last_fired:
+            return deadline
+        return None
 
-    async def generate_summary(self):
-        date = datetime.utcnow().strftime("%Y-%m-%d")
-        path = self.daily_dir / f"{date}.json"
+    def seconds_until_next(self) -> float:
+        now = datetime.utcnow()
+        if self._pending(now):
+            return 0.0
+        upcoming = self._latest_deadline(now) + timedelta(days=1)
+        return (upcoming - now).total_seconds()
 
-        if not path.exists():
-            log.warning("No daily stats collected yet.")
+    async def tick(self):
+        if not self.running:
             return
 
-        snapshots = []
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    snapshots.append(json.loads(line))
-                except:
-                    pass
+        deadline = self._pending(datetime.utcnow())
+        if not deadline:
+            return  # woke a little early, the scheduler re-arms for the remainder
 
-        if len(snapshots) < 2:
-            log.warning("Not enough snapshots for daily summary.")
-            return
+        date = deadline.strftime("%Y-%m-%d")
+        self.last_fired = date
+        self._save_state()
+        await self.generate_summary(date)
+
+    # ----------------------------------------------------------------------
+    # State
+    # ----------------------------------------------------------------------
+    def _load_state(self):
+        if self.state_path.exists():
+            try:
+                with self.state_path.open("r", encoding="utf-8") as f:
+                    self.last_fired = json.load(f).get("last_fired")
+                return
+            except Exception as e:
+                log.error(f"Failed to load daily summary state: {e}")
+
+        # First run: nothing was missed, start with the next deadline
+        self.last_fired = self._latest_deadline(datetime.utcnow()).strftime("%Y-%m-%d")
 
-        first = snapshots[0]
-        last = snapshots[-1]
+    def _save_state(self):
+        try:
+            with self.state_path.open("w", encoding="utf-8") as f:
+                json.dump({"last_fired": self.last_fired}, f)
+        except Exception as e:
+            log.error(f"Failed to save daily summary state: {e}")
 
-        summary = {
+    # ----------------------------------------------------------------------
+    # Summary
+    # ----------------------------------------------------------------------
+    async def generate_summary(self, date: str = None):
+        date = date or datetime.utcnow().strftime("%Y-%m-%d")
+        for creator in list(self.creator_registry.creators.values()):
+            await creator.daily_save_engine.flush()
+            summary = self._summarize(creator.username, creator.daily_dir, date)
+            if not summary:
+                continue
+
+            log.info(f"Daily summary: {summary}")
+
+            if self.on_daily_summary:
+                await self.on_daily_summary(summary)
+
+    def _summarize(self, username, daily_dir, date: str):
+        path = daily_dir / f"{date}.json"
+
+        if not path.exists():
+            log.warning(f"No daily stats collected on {date} for @{username}.")
+            return None
+
+        # Only the ends of the journal matter: the first keyframe and the tail
+        # from the last keyframe, so the cost doesn't grow with the poll count
+        first = read_first_state(path)
+        last = read_last_state(path)
+
+        # Unchanged stats aren't journaled, so a single keyframe means no change all day
+        if not first or not last:
+            log.warning(f"Not enough snapshots for daily summary of @{username}.")
+            return None
+
+        return {
+            "username": username,
+            "date": date,
             "followers": last["followers"],
             "followers_gained": last["followers"] - first["followers"],
             "likes_gained": last["likes"] - first["likes"],
             "views_gained": last["views"] - first["views"],
         }
-
-        log.info(f"Daily summary: {summary}")
-
-        if self.on_daily_summary:
-            await self.on_daily_summary(summary)
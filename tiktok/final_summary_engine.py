@@ -1,10 +1,114 @@
+import time
 from utils.logger import log
 
 
 class FinalSummaryEngine:
-    def __init__(self, cfg_mgr):
+    """
+    Running aggregates for the current live session, updated per sample
+    in O(1) time and memory, so the final summary is ready the moment
+    the stream ends without rereading anything that was recorded.
+    """
+
+    def __init__(self, cfg_mgr, tiktok_client):
         self.cfg_mgr = cfg_mgr
+        self.client = tiktok_client
         self.on_final_summary = None  # callback
+        self._reset()
+
+    def _reset(self):
+        self.started_at = None
+        self.last_at = None
+        self.samples = 0
+        self.viewers_sum = 0
+        self.peak_viewers = None
+        self.min_viewers = None
+        self.viewer_minutes = 0.0
+        self.title = None
+        self.title_changes = 0
+        self._last_viewers = 0
+        self._profile_start = None
+
+    # ----------------------------------------------------------------------
+    # Aggregation
+    # ----------------------------------------------------------------------
+    async def begin(self):
+        self._reset()
+        self.started_at = time.time()
+        self._profile_start = await self.client.fetch_profile_stats()
+
+    def add(self, stats):
+        now = time.time()
+        viewers = int(stats.get("viewer_count") or 0)
+
+        if self.last_at is not None:
+            # Each sample's count holds until the next one
+            self.viewer_minutes += self._last_viewers * (now - self.last_at) / 60
+        self.last_at = now
+        self._last_viewers = viewers
+
+        self.samples += 1
+        self.viewers_sum += viewers
+        self.peak_viewers = viewers if self.peak_viewers is None else max(self.peak_viewers, viewers)
+        self.min_viewers = viewers if self.min_viewers is None else min(self.min_viewers, viewers)
+
+        title = stats.get("title")
+        if title and title != self.title:
+            if self.title is not None:
+                self.title_changes += 1
+            self.title = title
+
+    async def finish(self):
+        """The session's summary; the live end is taken as the last live sample."""
+        if self.started_at is None or not self.samples:
+            return None
+
+        profile_end = await self.client.fetch_profile_stats()
+        duration = max(self.last_at - self.started_at, 0.0)
+        minutes = duration / 60
+
+        mean = round(self.viewers_sum / self.samples, 1)
+        summary = {
+            "username": self.client.username,
+            "started_at": self.started_at,
+            "ended_at": self.last_at,
+            "duration_minutes": round(minutes, 1),
+            "samples": self.samples,
+            "peak_viewers": self.peak_viewers,
+            "min_viewers": self.min_viewers,
+            "mean_viewers": mean,
+            # Time-weighted, so uneven sample spacing doesn't skew it
+            "avg_viewers": round(self.viewer_minutes / minutes, 1) if minutes else mean,
+            "viewer_minutes": round(self.viewer_minutes),
+            "title": self.title,
+            "title_changes": self.title_changes,
+            "followers_gained": self._delta(profile_end, "followers"),
+            "likes_gained": self._delta(profile_end, "likes"),
+        }
+        self._reset()
+        return summary
+
+    def _delta(self, profile_end, key: str):
+        if not self._profile_start or not profile_end:
+            return None
+        return profile_end[key] - self._profile_start[key]
+
+    # ----------------------------------------------------------------------
+    # Output
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def format(summary) -> str:
+        def signed(value):
+            return "n/a" if value is None else f"{value:+,}"
+
+        return "\n".join([
+            f"Duration: {summary['duration_minutes']} min",
+            f"Viewers: peak {summary['peak_viewers']:,}, min {summary['min_viewers']:,}, "
+            f"avg {summary['avg_viewers']:,}",
+            f"Viewer-minutes: {summary['viewer_minutes']:,}",
+            f"Title changes: {summary['title_changes']}",
+            f"Followers: {signed(summary['followers_gained'])}",
+            f"Likes: {signed(summary['likes_gained'])}",
+        ])
 
     async def run(self, live_data):
         log.info("FinalSummaryEngine generating final summary.")
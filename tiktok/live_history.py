@@ -0,0 +1,85 @@
+import json
+from datetime import datetime
+from utils.async_writer import submit_io
+from utils.logger import log
+
+
+DAYS = 7
+HOURS = 24
+SLOTS = DAYS * HOURS
+
+# Each new live start fades older ones so changed habits are picked up
+DECAY = 0.97
+# Weight every hour keeps even without history, so no window is never polled
+PRIOR = 0.2
+
+
+class LiveHistory:
+    """
+    Per-creator histogram of live-start times by UTC weekday and hour,
+    persisted as JSON. Used to spend a fixed daily request budget where
+    the creator is most likely to go live.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.counts = [0.0] * SLOTS
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            counts = [float(c) for c in data.get("counts", [])]
+            if len(counts) == SLOTS:
+                self.counts = counts
+        except Exception as e:
+            log.error(f"Failed to load live history {self.path.name}: {e}")
+
+    def save(self):
+        """Queue the write on the shared I/O thread; never blocks the caller."""
+        submit_io(self._write, [round(c, 4) for c in self.counts])
+
+    def _write(self, counts):
+        try:
+            with self.path.open("w", encoding="utf-8") as f:
+                json.dump({"counts": counts}, f)
+        except Exception as e:
+            log.error(f"Failed to save live history {self.path.name}: {e}")
+
+    @staticmethod
+    def _slot(when: datetime) -> int:
+        return when.weekday() * HOURS + when.hour
+
+    def record_start(self, when: datetime = None):
+        when = when or datetime.utcnow()
+        self.counts = [c * DECAY for c in self.counts]
+        self.counts[self._slot(when)] += 1.0
+        self.save()
+
+    def total_starts(self) -> float:
+        return sum(self.counts)
+
+    def weights(self):
+        """Smoothed (+-1 hour, wrapping around the week) slot weights plus the prior."""
+        c = self.counts
+        return [
+            PRIOR + 0.25 * c[i - 1] + 0.5 * c[i] + 0.25 * c[(i + 1) % SLOTS]
+            for i in range(SLOTS)
+        ]
+
+    def interval_for(self, when: datetime, daily_budget: int, min_interval: float) -> float:
+        """
+        Seconds between detection requests during the hour containing
+        `when`. The week's budget (daily_budget * 7) is split across the
+        168 hourly slots in proportion to their weight, so total requests
+        stay within budget; min_interval only ever lowers the spend.
+        """
+        weights = self.weights()
+        share = weights[self._slot(when)] / sum(weights)
+        requests_this_hour = daily_budget * DAYS * share
+        if requests_this_hour <= 0:
+            return 3600.0
+        return max(min_interval, 3600.0 / requests_this_hour)
@@ -0,0 +1,191 @@
+import time
+from tiktok.rate_limiter import high_priority
+from utils.logger import log
+from utils.scheduler import PRIORITY_HIGH
+
+
+OFFLINE = "offline"
+STARTING = "starting"  # saw live, waiting for start confirmations
+LIVE = "live"
+ENDING = "ending"      # saw offline while live, waiting for end confirmations
+
+
+class LiveSession:
+    """
+    One creator's live state machine. It owns the only sampling job for a
+    stream ("<username>:live" on the scheduler), so a flapping status can
+    never leave duplicate loops behind: add_job replaces by key.
+
+    The offline detector (PollingEngine) feeds observations in through
+    observe(). Once a stream is seen, the session samples it every
+    live_session.sample_interval seconds. From that one sample stream it
+    emits:
+
+        on_live_start(stats)   after start_confirmations live samples
+        on_sample(stats)       for every live sample
+        on_summary(stats)      every intervals.live_summary minutes
+        on_live_end(summary)   after end_confirmations offline samples
+
+    Unknown samples (fetch failed / rate limited) never move the state.
+    Live samples are also written to the optional StreamRecorder and fed
+    to the FinalSummaryEngine, whose aggregates become the end summary.
+    """
+
+    def __init__(
+        self,
+        cfg_mgr,
+        tiktok_client,
+        scheduler,
+        interval_fn,
+        history=None,
+        recorder=None,
+        final_summary=None,
+    ):
+        self.cfg_mgr = cfg_mgr
+        self.client = tiktok_client
+        self.scheduler = scheduler
+        self.interval_fn = interval_fn  # per-creator interval lookup, e.g. Creator.interval
+        self.history = history          # LiveHistory, learns when this creator goes live
+        self.recorder = recorder        # StreamRecorder, viewer time series per stream
+        self.final_summary = final_summary  # FinalSummaryEngine, running aggregates
+        self.username = tiktok_client.username
+        self.job_key = f"{self.username}:live"
+
+        self.state = OFFLINE
+        self.started_at = None
+        self._live_hits = 0
+        self._offline_hits = 0
+        self._last_summary = None
+
+        # Callbacks
+        self.on_live_start = None
+        self.on_sample = None
+        self.on_summary = None
+        self.on_live_end = None
+
+    # ----------------------------------------------------------------------
+    # Settings (read live from config)
+    # ----------------------------------------------------------------------
+    @property
+    def settings(self):
+        return self.cfg_mgr.config.get("live_session") or {}
+
+    @property
+    def sample_interval(self) -> float:
+        return float(self.settings.get("sample_interval", 10))
+
+    @property
+    def start_confirmations(self) -> int:
+        return int(self.settings.get("start_confirmations", 1))
+
+    @property
+    def end_confirmations(self) -> int:
+        return int(self.settings.get("end_confirmations", 3))
+
+    @property
+    def is_active(self) -> bool:
+        """True while the session (not the offline poller) owns sampling."""
+        return self.state != OFFLINE
+
+    # ----------------------------------------------------------------------
+    # State machine
+    # ----------------------------------------------------------------------
+    async def observe(self, stats):
+        if stats is None:
+            return  # unknown, keep the current state
+
+        if stats.get("is_live"):
+            self._offline_hits = 0
+            if self.state == OFFLINE:
+                self._live_hits = 0
+                self.state = STARTING
+                self._start_sampling()
+            if self.state == STARTING:
+                self._live_hits += 1
+                if self._live_hits >= self.start_confirmations:
+                    await self._begin(stats)
+            elif self.state == ENDING:
+                log.info(f"@{self.username} is back live — stream continues.")
+                self.state = LIVE
+
+            if self.state == LIVE:
+                if self.recorder:
+                    self.recorder.record(stats)
+                if self.final_summary:
+                    self.final_summary.add(stats)
+                await self._emit(self.on_sample, stats)
+                await self._maybe_summarize(stats)
+            return
+
+        if self.state == STARTING:
+            # Never confirmed, drop it without any events
+            self._reset()
+        elif self.state in (LIVE, ENDING):
+            self._offline_hits += 1
+            self.state = ENDING
+            if self._offline_hits >= self.end_confirmations:
+                await self._end()
+
+    async def sample(self):
+        """The session's sampling job."""
+        if not self.is_active:
+            return
+        high_priority.set(True)
+        await self.observe(await self.client.fetch_live_status())
+
+    async def _begin(self, stats):
+        self.state = LIVE
+        self.started_at = time.time()
+        self._last_summary = time.monotonic()
+        log.info(f"Stream detected for @{self.username} — switching to live mode.")
+        if self.history:
+            self.history.record_start()
+        if self.recorder:
+            self.recorder.open(stats)
+        # Announce first: begin() reads the profile stats, which is a page
+        # fetch (and a rate limiter wait) once the confirming snapshot expired
+        await self._emit(self.on_live_start, stats)
+        if self.final_summary:
+            await self.final_summary.begin()
+
+    async def _end(self):
+        log.info(f"Stream ended for @{self.username} — triggering final summary.")
+        summary = await self.final_summary.finish() if self.final_summary else None
+        self._reset()
+        await self._emit(self.on_live_end, summary)
+
+    async def _maybe_summarize(self, stats):
+        every = self.interval_fn("live_summary") * 60
+        if time.monotonic() - self._last_summary >= every:
+            self._last_summary = time.monotonic()
+            await self._emit(self.on_summary, stats)
+
+    # ----------------------------------------------------------------------
+    # Internal
+    # ----------------------------------------------------------------------
+    def _start_sampling(self):
+        self.scheduler.add_job(
+            self.job_key,
+            self.sample,
+            lambda: self.sample_interval,
+            owner=self.username,
+            delay=self.sample_interval,
+            priority=PRIORITY_HIGH,
+        )
+
+    def _reset(self):
+        self.scheduler.remove_job(self.job_key)
+        if self.recorder:
+            self.recorder.close()
+        self.state = OFFLINE
+        self.started_at = None
+        self._live_hits = 0
+        self._offline_hits = 0
+        self._last_summary = None
+
+    async def _emit(self, callback, *args):
+        if callback:
+            await callback(*args)
+
+    def stop(self):
+        self._reset()
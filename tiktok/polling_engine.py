@@ -1,33 +1,73 @@
-import asyncio
+import time
+from tiktok.rate_limiter import high_priority
 from utils.logger import log
 
 
+# While the probe keeps reporting live but the profile page doesn't (stale or
+# missing isLive), the page is re-checked at most this often
+RECONFIRM_INTERVAL = 300  # seconds
+
+
 class PollingEngine:
-    def __init__(self, cfg_mgr, tiktok_client, interval_minutes: int):
+    """
+    Offline live detector. Its observations go to the creator's
+    LiveSession, which takes over sampling once a stream is seen.
+    """
+
+    def __init__(self, cfg_mgr, tiktok_client, session):
         self.cfg_mgr = cfg_mgr
         self.client = tiktok_client
-        self.interval = interval_minutes  # minutes
+        self.session = session     # LiveSession
         self.running = False
-        self.on_live_start = None  # callback
-        self._was_live = False     # track previous state
+        self._seen_version = None  # snapshot_version of the last evaluated snapshot
+        self._probe_live = False   # last probe answer
+        self._confirmed_at = None  # time.monotonic() of the last probe-triggered page fetch
 
-    async def start(self):
+    def start(self):
         self.running = True
-        log.info("PollingEngine started.")
 
-        while self.running:
-            stats = await self.client.fetch_live_status()
+    async def tick(self):
+        if not self.running or self.session.is_active:
+            return  # the live session samples on its own while a stream is up
+
+        stats = await self.client.fetch_live_status()
+        if stats is None:
+            return  # unknown (fetch failed / rate limited), keep previous state
+
+        version = self.client.snapshot_version
+        if version == self._seen_version:
+            return  # same page content as last time, nothing can have changed
+        self._seen_version = version
+
+        await self.session.observe(stats)
+
+    async def probe(self):
+        """
+        Cheap high-frequency check. The full profile fetch in tick() only
+        runs when the probe flips from offline to live; if the page then
+        disagrees, it is re-checked every RECONFIRM_INTERVAL at most
+        instead of on every probe.
+        """
+        if not self.running or self.session.is_active:
+            return
 
-            if stats and stats.get("is_live"):
-                if not self._was_live:
-                    log.info("Stream detected — switching to live mode.")
-                    self._was_live = True
-                    if self.on_live_start:
-                        await self.on_live_start(stats)
-            else:
-                self._was_live = False
+        live = await self.client.probe_live()
+        if live is None:
+            return  # unknown, keep the last answer
+        was_live, self._probe_live = self._probe_live, live
+        if not live:
+            return
 
-            await asyncio.sleep(self.interval * 60)
+        now = time.monotonic()
+        if was_live and now - self._confirmed_at < RECONFIRM_INTERVAL:
+            return
+        if not was_live:
+            log.info(f"Live probe reports @{self.client.username} live — confirming.")
+        self._confirmed_at = now
+        # The confirm fetch goes ahead of queued bulk requests
+        high_priority.set(True)
+        self.client.invalidate_snapshot()
+        await self.tick()
 
     def stop(self):
         self.running = False
@@ -0,0 +1,201 @@
+import asyncio
+import contextvars
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from utils.logger import log
+
+
+# Set to True by latency-sensitive work (live sampling, confirming a stream)
+# for the rest of its task; its requests take tokens before bulk requests
+high_priority = contextvars.ContextVar("high_priority", default=False)
+
+
+class RateLimitedError(Exception):
+    """Raised when a request would have to wait longer than max_wait for budget."""
+
+    def __init__(self, wait: float):
+        super().__init__(f"rate limited for another {wait:.0f}s")
+        self.wait = wait
+
+
+def parse_retry_after(value):
+    """Retry-After is either delta-seconds or an HTTP date; returns seconds or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every TikTok request in the process.
+
+    Requests take one token; tokens refill at `rate` per second up to
+    `burst`. A 429 or 5xx response blocks the bucket for max(Retry-After,
+    exponential backoff) seconds, where the backoff starts at
+    intervals.retry, doubles per consecutive failure up to max_backoff and
+    is jittered. The refill rate is also halved on every throttle and
+    creeps back to the configured rate on success (AIMD), so we settle
+    just under whatever TikTok currently tolerates.
+
+    Callers that would have to wait longer than max_wait get a
+    RateLimitedError instead of tying up a scheduler slot for the whole
+    block. Requests made under high_priority queue separately and bulk
+    requests yield tokens to them. wait_time() lets the scheduler hold
+    back bulk jobs until a token is free instead of having them wait
+    inside acquire().
+    """
+
+    def __init__(self, config=None, intervals=None):
+        self.config = config if config is not None else {}
+        self.intervals = intervals if intervals is not None else {}
+
+        self.rate = self.max_rate
+        self.tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()       # bulk requests queue FIFO
+        self._high_lock = asyncio.Lock()  # high-priority requests queue FIFO
+        self._high_waiting = 0
+        self._waiting = 0
+
+        self.blocked_until = 0.0
+        self.failures = 0
+
+        # Metrics
+        self.requests = 0
+        self.throttled = 0
+        self.rejected = 0
+
+    # ----------------------------------------------------------------------
+    # Settings (read live from config)
+    # ----------------------------------------------------------------------
+    @property
+    def max_rate(self) -> float:
+        return float(self.config.get("rate", 1.0))
+
+    @property
+    def burst(self) -> int:
+        return int(self.config.get("burst", 5))
+
+    @property
+    def max_wait(self) -> float:
+        return float(self.config.get("max_wait", 30))
+
+    @property
+    def max_backoff(self) -> float:
+        return float(self.config.get("max_backoff", 900))
+
+    @property
+    def retry_base(self) -> float:
+        return float(self.intervals.get("retry", 30))
+
+    # ----------------------------------------------------------------------
+    # Budget
+    # ----------------------------------------------------------------------
+    def _refill(self, now: float):
+        self.tokens = min(float(self.burst), self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        high = high_priority.get()
+        self._waiting += 1
+        if high:
+            self._high_waiting += 1
+        try:
+            async with self._high_lock if high else self._lock:
+                await self._take(high)
+        finally:
+            self._waiting -= 1
+            if high:
+                self._high_waiting -= 1
+
+    async def _take(self, high: bool):
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                wait = self.blocked_until - now
+            else:
+                self._refill(now)
+                if self.tokens >= 1 and (high or not self._high_waiting):
+                    self.tokens -= 1
+                    self.requests += 1
+                    return
+                if self.tokens >= 1:
+                    # A bulk request lets the waiting high-priority one go first
+                    wait = 1 / self.rate
+                else:
+                    wait = (1 - self.tokens) / self.rate
+
+            if wait > self.max_wait:
+                self.rejected += 1
+                raise RateLimitedError(wait)
+            await asyncio.sleep(wait)
+
+    def wait_time(self) -> float:
+        """Seconds until a new request could get a token without queueing behind others."""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        free = self.tokens - self._waiting
+        return 0.0 if free >= 1 else (1 - free) / self.rate
+
+    def report(self, status: int, retry_after=None):
+        """Feed back the status of a completed request."""
+        if status == 429 or status >= 500:
+            self._throttle(f"HTTP {status}", parse_retry_after(retry_after))
+            return
+
+        self.failures = 0
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def report_soft_block(self):
+        """A 200 response that didn't contain the data we asked for (captcha/verify page)."""
+        self._throttle("Soft block", None)
+
+    def _throttle(self, reason: str, retry_after):
+        self.failures += 1
+        self.throttled += 1
+        self.rate = max(self.max_rate / 16, self.rate / 2)
+
+        backoff = min(self.max_backoff, self.retry_base * 2 ** (self.failures - 1))
+        backoff = random.uniform(backoff / 2, backoff)
+        delay = max(backoff, retry_after or 0.0)
+
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        self.tokens = 0.0
+        self._updated = self.blocked_until
+        log.warning(
+            f"[TikTokAPI] {reason} from TikTok, backing off {delay:.0f}s "
+            f"(failure #{self.failures}, rate now {self.rate:.2f}/s)."
+        )
+
+    # ----------------------------------------------------------------------
+    # Metrics
+    # ----------------------------------------------------------------------
+    def get_metrics(self):
+        now = time.monotonic()
+        if now >= self.blocked_until:
+            self._refill(now)
+        return {
+            "tokens": round(self.tokens, 2),
+            "burst": self.burst,
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "blocked_for": round(max(self.blocked_until - now, 0.0), 1),
+            "failures": self.failures,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,164 @@
+import json
+import re
+import time
+
+try:
+    import orjson
+except ImportError:  # optional fast backend
+    orjson = None
+
+
+SIGI_OPEN = b'<script id="SIGI_STATE"'
+SIGI_CLOSE = b"</script>"
+
+# A SIGI_STATE blob larger than this means we are not looking at a profile page
+MAX_BLOB_BYTES = 8 * 1024 * 1024
+
+
+class SigiStateScanner:
+    """
+    Incremental extractor for the <script id="SIGI_STATE"> blob.
+
+    Feed it raw response chunks as they arrive; it keeps only the bytes it
+    still needs (a marker-sized tail before the blob, the blob itself once
+    it has started) and reports completion as soon as </script> closes the
+    blob, so the caller can stop reading the rest of the page.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BLOB_BYTES):
+        self.max_bytes = max_bytes
+        self.blob = None
+        self.done = False
+
+        self._buf = bytearray()
+        self._in_blob = False
+        self._scan_from = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume one chunk. Returns True once the blob is complete (or given up on)."""
+        if self.done:
+            return True
+
+        buf = self._buf
+        buf += chunk
+
+        if not self._in_blob:
+            start = buf.find(SIGI_OPEN)
+            if start < 0:
+                # Keep just enough of the tail to match a marker split across chunks
+                del buf[: max(0, len(buf) - (len(SIGI_OPEN) - 1))]
+                return False
+
+            tag_end = buf.find(b">", start + len(SIGI_OPEN))
+            if tag_end < 0:
+                del buf[:start]
+                return False
+
+            del buf[: tag_end + 1]
+            self._in_blob = True
+            self._scan_from = 0
+
+        end = buf.find(SIGI_CLOSE, self._scan_from)
+        if end < 0:
+            if len(buf) > self.max_bytes:
+                self._finish(None)
+                return True
+            self._scan_from = max(0, len(buf) - (len(SIGI_CLOSE) - 1))
+            return False
+
+        self._finish(bytes(buf[:end]))
+        return True
+
+    def _finish(self, blob):
+        self.blob = blob
+        self.done = True
+        self._buf = bytearray()
+
+
+# ----------------------------------------------------------------------
+# Selective decoding
+# ----------------------------------------------------------------------
+# A JSON string or a bracket; strings are matched whole so brackets inside
+# them don't count towards the nesting depth
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]')
+_COLON = re.compile(rb"\s*:\s*")
+
+
+def _full_loads(blob: bytes):
+    if orjson is not None:
+        return orjson.loads(blob)
+    return json.loads(blob)
+
+
+def _find_user_module(blob: bytes):
+    """(start, end) of the value of the top-level "UserModule" key, or None."""
+    depth = 0
+    start = None
+    for token in _TOKEN.finditer(blob):
+        t = token.group()
+        if t == b"{" or t == b"[":
+            depth += 1
+        elif t == b"}" or t == b"]":
+            depth -= 1
+            if start is not None and depth == 1:
+                return start, token.end()
+            if depth <= 0:
+                return None
+        elif start is None and depth == 1 and t == b'"UserModule"':
+            colon = _COLON.match(blob, token.end())
+            if colon and blob[colon.end():colon.end() + 1] == b"{":
+                start = colon.end()
+    return None
+
+
+def _decode_user_module_targeted(blob: bytes):
+    """
+    Decode only the value of the top-level "UserModule" key. The blob is
+    tokenized just far enough to find where that subtree starts and ends
+    (a nested key of the same name is skipped), and only those bytes are
+    parsed. Returns None if the key can't be located.
+    """
+    span = _find_user_module(blob)
+    if span is None:
+        return None
+    module = _full_loads(blob[span[0]:span[1]])
+    return module if isinstance(module, dict) else None
+
+
+def decode_user_module(blob: bytes, username: str, mode: str = "targeted"):
+    """
+    Project a SIGI_STATE blob down to what the engines read:
+        {"user": dict | None, "stats": dict | None}
+    Returns None if the blob can't be decoded.
+
+    mode "targeted" decodes only the UserModule subtree and falls back to a
+    full decode if it can't be found; mode "full" always decodes the whole
+    blob. Full decodes use orjson when it is installed.
+    """
+    module = None
+    if mode != "full":
+        try:
+            module = _decode_user_module_targeted(blob)
+        except ValueError:
+            module = None
+
+    try:
+        if module is None:
+            data = _full_loads(blob)
+            if not isinstance(data, dict):
+                return None
+            module = data.get("UserModule") or {}
+    except Exception:
+        return None
+
+    return {
+        "user": (module.get("users") or {}).get(username),
+        "stats": (module.get("stats") or {}).get(username),
+    }
+
+
+def timed_decode(blob: bytes, username: str, mode: str = "targeted"):
+    """decode_user_module() plus its wall time in ms; runs in the parse pool."""
+    start = time.perf_counter()
+    snapshot = decode_user_module(blob, username, mode)
+    return snapshot, (time.perf_counter() - start) * 1000
@@ -0,0 +1,219 @@
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from tiktok.stats_journal import FIELDS, apply, is_keyframe
+from utils.json_store import read_jsonl
+from utils.logger import log
+
+# Monthly archive of closed days, <daily_dir>/archive/YYYY-MM.stats:
+#
+#   magic "TTAR" | u32 index length | JSON index | column blocks
+#
+# The index is the time index: for every day its row count, first/last
+# timestamp and, per column, the (offset, length) of a zlib-compressed
+# block of delta-encoded int64 values. A range query reads the index,
+# then only the blocks of the days and columns it needs.
+
+ARCHIVE_MAGIC = b"TTAR"
+ARCHIVE_HEADER = struct.Struct("<4sI")
+COLUMNS = ("t",) + FIELDS  # t is stored in tenths of a second
+DAY_FILE_SUFFIX = ".json"
+
+
+# ----------------------------------------------------------------------
+# Column encoding
+# ----------------------------------------------------------------------
+def _encode_column(values) -> bytes:
+    deltas = array("q", (b - a for a, b in zip([0] + values[:-1], values)))
+    if sys.byteorder != "little":
+        deltas.byteswap()
+    return zlib.compress(deltas.tobytes(), 9)
+
+
+def _decode_column(blob: bytes):
+    deltas = array("q")
+    deltas.frombytes(zlib.decompress(blob))
+    if sys.byteorder != "little":
+        deltas.byteswap()
+    values, total = [], 0
+    for d in deltas:
+        total += d
+        values.append(total)
+    return values
+
+
+# ----------------------------------------------------------------------
+# Archive files
+# ----------------------------------------------------------------------
+def _read_index(f):
+    raw = f.read(ARCHIVE_HEADER.size)
+    magic, index_len = ARCHIVE_HEADER.unpack(raw)
+    if magic != ARCHIVE_MAGIC:
+        raise ValueError(f"bad archive magic {magic!r}")
+    return json.loads(f.read(index_len).decode("utf-8")), ARCHIVE_HEADER.size + index_len
+
+
+def read_archive_index(path):
+    with path.open("rb") as f:
+        index, _ = _read_index(f)
+    return index
+
+
+def _read_blocks(path):
+    """{date: {column: compressed block}} for every day in an archive."""
+    if not path.exists():
+        return {}
+    with path.open("rb") as f:
+        index, base = _read_index(f)
+        days = {}
+        for date, day in index["days"].items():
+            days[date] = {}
+            for column, (offset, length) in day["columns"].items():
+                f.seek(base + offset)
+                days[date][column] = f.read(length)
+    return days
+
+
+def _write_archive(path, blocks, meta):
+    index = {"version": 1, "days": {}}
+    body = []
+    offset = 0
+    for date in sorted(blocks):
+        columns = {}
+        for column in COLUMNS:
+            blob = blocks[date][column]
+            columns[column] = [offset, len(blob)]
+            body.append(blob)
+            offset += len(blob)
+        index["days"][date] = {**meta[date], "columns": columns}
+
+    raw_index = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("wb") as f:
+        f.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, len(raw_index)))
+        f.write(raw_index)
+        for blob in body:
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _day_rows(day_file, date: str):
+    """Replay a day's journal into full rows [(t, followers, likes, views)]."""
+    midnight = datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+    rows, state = [], None
+    for record in read_jsonl(day_file):
+        state = apply(state, record)
+        if state is None or not (is_keyframe(record) or "d" in record):
+            continue  # failure markers carry no stats
+        t = record.get("t", midnight)
+        rows.append((int(round(t * 10)),) + tuple(state[key] for key in FIELDS))
+    return rows
+
+
+def compact_daily_dir(daily_dir, keep_days: int = 2) -> int:
+    """
+    Move closed day files older than keep_days into their monthly archive,
+    then delete them. Blocking; run it off the event loop. Returns the
+    number of days compacted.
+    """
+    cutoff = (datetime.utcnow() - timedelta(days=keep_days)).strftime("%Y-%m-%d")
+    by_month = {}
+    for day_file in sorted(daily_dir.glob(f"*{DAY_FILE_SUFFIX}")):
+        date = day_file.stem
+        if len(date) == 10 and date < cutoff:
+            by_month.setdefault(date[:7], []).append(day_file)
+
+    archive_dir = daily_dir / "archive"
+    compacted = 0
+    for month, day_files in by_month.items():
+        archive_dir.mkdir(exist_ok=True)
+        path = archive_dir / f"{month}.stats"
+
+        blocks = _read_blocks(path)
+        meta = read_archive_index(path)["days"] if path.exists() else {}
+        meta = {date: {k: v for k, v in day.items() if k != "columns"} for date, day in meta.items()}
+
+        for day_file in day_files:
+            date = day_file.stem
+            rows = _day_rows(day_file, date)
+            if rows:
+                columns = list(zip(*rows))
+                blocks[date] = {c: _encode_column(list(v)) for c, v in zip(COLUMNS, columns)}
+                meta[date] = {"rows": len(rows), "t0": rows[0][0], "t1": rows[-1][0]}
+
+        if blocks:
+            _write_archive(path, blocks, meta)
+        for day_file in day_files:
+            day_file.unlink()
+            compacted += 1
+
+    if compacted:
+        log.info(f"Compacted {compacted} day file(s) in {daily_dir.name} into monthly archives.")
+    return compacted
+
+
+# ----------------------------------------------------------------------
+# Reader
+# ----------------------------------------------------------------------
+class StatsHistory:
+    """
+    Reads one creator's stats over a time range from both the monthly
+    archives and the day files that haven't been compacted yet. Archived
+    days outside the range, and columns not asked for, are never read.
+    """
+
+    def __init__(self, daily_dir):
+        self.daily_dir = daily_dir
+        self.archive_dir = daily_dir / "archive"
+
+    def query(self, start: datetime, end: datetime, fields=FIELDS):
+        """[{"t": unix seconds, <field>: value, ...}] for start <= t <= end (UTC), oldest first."""
+        t0 = start.replace(tzinfo=timezone.utc).timestamp()
+        t1 = end.replace(tzinfo=timezone.utc).timestamp()
+        columns = ("t",) + tuple(fields)
+
+        rows = []
+        day = start.date()
+        while day <= end.date():
+            date = day.strftime("%Y-%m-%d")
+            day_file = self.daily_dir / f"{date}{DAY_FILE_SUFFIX}"
+            if day_file.exists():
+                day_rows = _day_rows(day_file, date)
+                rows.extend(dict(zip(COLUMNS, r)) for r in day_rows)
+            else:
+                rows.extend(self._archived_day(date, columns))
+            day += timedelta(days=1)
+
+        result = []
+        for row in rows:
+            t = row["t"] / 10
+            if t0 <= t <= t1:
+                result.append({"t": t, **{key: row[key] for key in fields}})
+        return result
+
+    def _archived_day(self, date: str, columns):
+        path = self.archive_dir / f"{date[:7]}.stats"
+        if not path.exists():
+            return []
+        try:
+            with path.open("rb") as f:
+                index, base = _read_index(f)
+                day = index["days"].get(date)
+                if not day:
+                    return []
+                values = {}
+                for column in columns:
+                    offset, length = day["columns"][column]
+                    f.seek(base + offset)
+                    values[column] = _decode_column(f.read(length))
+        except Exception as e:
+            log.error(f"Failed to read stats archive {path.name}: {e}")
+            return []
+        return [dict(zip(columns, r)) for r in zip(*(values[c] for c in columns))]
@@ -0,0 +1,112 @@
+from datetime import timezone
+from utils.json_store import iter_jsonl, iter_jsonl_reverse
+
+# Journal record kinds, one JSON object per line:
+#   {"t": ts, "k": 1, "followers": .., "likes": .., "views": ..}  keyframe
+#   {"t": ts, "d": {"likes": 12}}                                 delta (changed fields only)
+#   {"t": ts, "err": "fetch_failed"}                              fetch failure marker
+# Lines written before the journal existed ({"followers", "likes", "views"})
+# read as keyframes.
+
+FIELDS = ("followers", "likes", "views")
+
+
+def is_keyframe(record) -> bool:
+    return "k" in record or ("d" not in record and "err" not in record and "followers" in record)
+
+
+class StatsJournal:
+    """
+    Encodes profile stats for one creator's daily files: a keyframe at the
+    start of each day and every `keyframe_every` records, deltas in
+    between, nothing at all for unchanged stats, and a single failure
+    marker per run of failed fetches instead of a row of zeros.
+    """
+
+    def __init__(self, writer, keyframe_every: int = 60):
+        self.writer = writer  # JsonlWriter for the daily files
+        self.keyframe_every = keyframe_every
+        self._date = None
+        self._last = None     # last stats written today
+        self._since_keyframe = 0
+        self._failing = False
+
+    def record(self, stats, when):
+        """
+        Journal one poll result (stats or None) taken at `when` (naive UTC).
+        Returns True if a line was written.
+        """
+        date = when.strftime("%Y-%m-%d")
+        if date != self._date:
+            self._date = date
+            self._last = None  # every day file starts with a keyframe
+            self._failing = False
+
+        ts = round(when.replace(tzinfo=timezone.utc).timestamp(), 1)
+
+        if stats is None:
+            if self._failing:
+                return False
+            self._failing = True
+            self._last = None  # recovery starts with a keyframe, even if nothing changed
+            return self._write({"t": ts, "err": "fetch_failed"}, when)
+        self._failing = False
+
+        stats = {key: stats[key] for key in FIELDS}
+        if self._last is None or self._since_keyframe >= self.keyframe_every:
+            self._since_keyframe = 0
+            self._last = stats
+            return self._write({"t": ts, "k": 1, **stats}, when)
+
+        delta = {key: stats[key] - self._last[key] for key in FIELDS if stats[key] != self._last[key]}
+        if not delta:
+            return False
+        self._last = stats
+        return self._write({"t": ts, "d": delta}, when)
+
+    def _write(self, record, when) -> bool:
+        self.writer.append(record, when)
+        self._since_keyframe += 1
+        return True
+
+
+def apply(state, record):
+    """Fold one journal record into state (a stats dict or None)."""
+    if is_keyframe(record):
+        return {key: record[key] for key in FIELDS}
+    if state is not None and "d" in record:
+        state = dict(state)
+        for key, change in record["d"].items():
+            state[key] = state.get(key, 0) + change
+    return state
+
+
+def read_first_state(path):
+    """
+    Stats at the start of a day file: its first keyframe. Reads forward
+    only that far, skipping failure markers written before it.
+    """
+    for record in iter_jsonl(path):
+        if is_keyframe(record):
+            return apply(None, record)
+    return None
+
+
+def read_last_state(path):
+    """
+    Stats at the end of a day file. Reads backwards only as far as the
+    last keyframe and replays the deltas after it, so the cost is bounded
+    by keyframe_every, not by the number of polls that day.
+    """
+    tail = []
+    for record in iter_jsonl_reverse(path):
+        tail.append(record)
+        if is_keyframe(record):
+            break
+    else:
+        return None
+
+    state = None
+    for record in reversed(tail):
+        state = apply(state, record)
+    return state
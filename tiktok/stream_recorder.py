@@ -0,0 +1,118 @@
+import struct
+import time
+from datetime import datetime
+
+from utils.async_writer import submit_io
+from utils.logger import log
+from utils.record_file import RecordReader, RecordWriter
+
+
+STREAM_MAGIC = b"TTLV"
+# timestamp (unix seconds), viewer count, index into the .titles file
+STREAM_RECORD = struct.Struct("<dIH2x")
+
+
+class StreamRecorder:
+    """
+    Records each live session as a viewer-count time series under
+    data/streams/<username>/<start>.bin (fixed 16-byte records, see
+    utils.record_file). Titles are variable length, so they go to a
+    sibling .titles file, one per line; each record carries the index of
+    the title that was showing, which makes title changes visible as
+    index changes.
+
+    The calls are cheap and never block: title bookkeeping happens on the
+    caller's side, the file work is queued on the shared I/O thread, which
+    runs it in order.
+    """
+
+    def __init__(self, streams_dir, username: str):
+        self.streams_dir = streams_dir
+        self.username = username
+        self.path = None
+        self.recording = False
+        self._title = None
+        self._title_index = -1
+        # Only touched on the I/O thread
+        self._writer = None
+        self._titles = None
+
+    def open(self, stats):
+        self.close()
+        started = datetime.utcnow()
+        self.path = self.streams_dir / f"{started.strftime('%Y%m%d-%H%M%S')}.bin"
+        meta = {
+            "username": self.username,
+            "room_id": stats.get("room_id"),
+            "started_at": started.isoformat() + "Z",
+        }
+        self.recording = True
+        self._title = None
+        self._title_index = -1
+        submit_io(self._open_files, self.path, meta)
+        log.info(f"Recording stream of @{self.username} to {self.path.name}.")
+
+    def record(self, stats):
+        if not self.recording:
+            return
+
+        title = stats.get("title") or ""
+        new_title = None
+        if title != self._title:
+            new_title = title.replace("\n", " ")
+            self._title = title
+            self._title_index += 1
+
+        submit_io(
+            self._write_sample,
+            time.time(), int(stats.get("viewer_count") or 0), self._title_index, new_title,
+        )
+
+    def close(self):
+        if self.recording:
+            self.recording = False
+            submit_io(self._close_files)
+
+    # ----------------------------------------------------------------------
+    # I/O thread
+    # ----------------------------------------------------------------------
+    def _open_files(self, path, meta):
+        try:
+            self._writer = RecordWriter(path, STREAM_RECORD, STREAM_MAGIC, meta).open()
+            self._titles = path.with_suffix(".titles").open("a", encoding="utf-8")
+        except Exception as e:
+            log.error(f"Failed to start stream recording for @{self.username}: {e}")
+            self._close_files()
+
+    def _write_sample(self, t: float, viewers: int, title_index: int, new_title):
+        if not self._writer:
+            return  # opening the files failed
+        try:
+            if new_title is not None:
+                self._titles.write(new_title + "\n")
+                self._titles.flush()
+            self._writer.append(t, viewers, title_index)
+        except Exception as e:
+            log.error(f"Failed to record stream sample for @{self.username}: {e}")
+
+    def _close_files(self):
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        if self._titles:
+            self._titles.close()
+            self._titles = None
+
+
+def read_stream(path):
+    """
+    (meta, titles, reader) for a recorded stream. reader is an mmap-backed
+    RecordReader yielding (timestamp, viewers, title_index); close it when
+    done.
+    """
+    titles_path = path.with_suffix(".titles")
+    titles = []
+    if titles_path.exists():
+        titles = titles_path.read_text(encoding="utf-8").splitlines()
+    reader = RecordReader(path, STREAM_RECORD, STREAM_MAGIC)
+    return reader.meta, titles, reader
@@ -1,20 +1,77 @@
 import asyncio
-import aiohttp
-import json
-import re
+import hashlib
+import time
+from tiktok.rate_limiter import RateLimitedError
+from tiktok.sigi_state import SigiStateScanner
+from tiktok.transport import TikTokTransport
 from utils.logger import log
 
 
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Live-room status codes returned by the api-live room endpoint
+ROOM_STATUS_LIVE = 2
+
+# Returned by _fetch_sigi_state() when the server answered 304 Not Modified
+NOT_MODIFIED = object()
+
+# Markup of TikTok's captcha / verify interstitials. Only a page without
+# SIGI_STATE that shows one of these counts as a block (global backoff);
+# otherwise the missing blob is this creator's page shape or a markup change.
+BLOCK_MARKERS = (b"captcha-verify", b"captcha_container", b"verify-bar")
+# Long enough to catch a marker split across two chunks
+_MARKER_OVERLAP = max(len(m) for m in BLOCK_MARKERS) - 1
+
+
 class TikTokAPI:
     """
     TikTok LIVE + profile detector using TikTok's public web API.
-    No API keys, no TikTokLive library, no rate limits.
-    Works on Termux.
+    No API keys, no TikTokLive library. Works on Termux.
+
+    HTTP and parsing go through a TikTokTransport (pooled session, shared
+    rate limiter, bounded parse pool) that can be shared between the APIs
+    of several creators;
+    an API created without one owns a private transport and closes it in
+    close().
+
+    The profile page is fetched and parsed once per snapshot; every
+    engine reads the same snapshot for snapshot_ttl seconds, and callers
+    that arrive while a fetch is in flight wait for that fetch instead of
+    starting their own.
+
+    Unchanged pages are not re-parsed: the page request is conditional
+    (If-None-Match / If-Modified-Since) when TikTok handed out validators,
+    and otherwise the extracted SIGI_STATE bytes are hashed and decoding is
+    skipped when the hash matches the previous poll. snapshot_version only
+    increments when the content actually changed, so engines can skip
+    their own work for repeated data.
     """
 
-    def __init__(self, username: str, retry_interval: int = 10):
+    def __init__(
+        self,
+        username: str,
+        retry_interval: int = 10,
+        http_config=None,
+        snapshot_ttl: float = 10,
+        parsing_config=None,
+        transport: TikTokTransport = None,
+    ):
         self.username = username.lstrip("@")
         self.retry_interval = retry_interval
+        self.snapshot_ttl = snapshot_ttl
+
+        self._owns_transport = transport is None
+        self.transport = transport or TikTokTransport(http_config, parsing_config)
+
+        # Profile snapshot cache
+        self._snapshot = None
+        self._snapshot_at = None
+        self._snapshot_task = None
+        self._snapshot_digest = None
+        self._etag = None
+        self._last_modified = None
+        self.snapshot_version = 0
+        self.missing_blob = 0  # consecutive pages without SIGI_STATE (no block marker)
 
         # Live state
         self.is_live = False
@@ -24,44 +81,169 @@ class TikTokAPI:
         self.thumbnail = None
 
     # ----------------------------------------------------------------------
-    # INTERNAL: Fetch TikTok profile HTML
+    # Shutdown
+    # ----------------------------------------------------------------------
+    async def close(self):
+        if self._owns_transport:
+            await self.transport.close()
+
+    # ----------------------------------------------------------------------
+    # INTERNAL: Stream the SIGI_STATE blob out of the profile HTML
     # ----------------------------------------------------------------------
-    async def _fetch_profile_html(self):
+    async def _fetch_sigi_state(self):
+        """
+        TikTok embeds JSON inside <script id="SIGI_STATE"> ... </script>.
+        The page is scanned chunk by chunk as raw bytes and the response is
+        closed as soon as the blob ends; the rest of the page is never read.
+        """
         url = f"https://www.tiktok.com/@{self.username}"
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Linux; Android 10; Mobile) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Mobile Safari/537.36"
-            )
-        }
+
+        headers = {}
+        if self._snapshot is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as resp:
-                    return await resp.text()
+            async with self.transport.request(url, headers=headers or None) as resp:
+                if resp.status == 304:
+                    return NOT_MODIFIED
+                if resp.status != 200:
+                    log.error(f"[TikTokAPI] Failed to fetch profile HTML: HTTP {resp.status}")
+                    return None
+
+                self._etag = resp.headers.get("ETag")
+                self._last_modified = resp.headers.get("Last-Modified")
+
+                scanner = SigiStateScanner()
+                blocked = self._redirected_to_verify(resp)
+                tail = b""
+                async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    if scanner.feed(chunk):
+                        resp.close()
+                        break
+                    if not blocked:
+                        window = tail + chunk
+                        blocked = any(m in window for m in BLOCK_MARKERS)
+                        tail = window[-_MARKER_OVERLAP:]
+
+                if scanner.blob is None:
+                    self._report_missing_blob(blocked)
+                elif self.missing_blob:
+                    log.info(f"[TikTokAPI] SIGI_STATE is back on @{self.username}'s page.")
+                    self.missing_blob = 0
+                return scanner.blob
+        except RateLimitedError:
+            return None
         except Exception as e:
             log.error(f"[TikTokAPI] Failed to fetch profile HTML: {e}")
             return None
 
+    def _redirected_to_verify(self, resp) -> bool:
+        """Whether TikTok redirected the profile request to a verify page."""
+        if not resp.history:
+            return False
+        path = resp.url.path
+        # The username is part of the profile path, so only look elsewhere
+        return not path.startswith(f"/@{self.username}") and "verify" in path.lower()
+
+    def _report_missing_blob(self, blocked: bool):
+        if blocked:
+            # A captcha/verify page: TikTok is throttling us, back off everyone
+            self.transport.rate_limiter.report_soft_block()
+            return
+        # Only this creator's page is affected; it just yields no data
+        self.missing_blob += 1
+        if self.missing_blob == 1:
+            log.warning(
+                f"[TikTokAPI] No SIGI_STATE on @{self.username}'s page "
+                f"(page layout changed or profile unavailable)."
+            )
+
     # ----------------------------------------------------------------------
-    # INTERNAL: Extract JSON data from HTML
+    # PUBLIC: Shared profile snapshot
     # ----------------------------------------------------------------------
-    def _extract_json(self, html: str):
+    async def fetch_snapshot(self):
         """
-        TikTok embeds JSON inside <script id="SIGI_STATE"> ... </script>
+        Returns the cached profile snapshot, fetching it at most once per
+        snapshot_ttl seconds:
+            {"user": dict | None, "stats": dict | None}
+        or None if the page could not be fetched or parsed.
         """
+        if (
+            self._snapshot_at is not None
+            and time.monotonic() - self._snapshot_at < self.snapshot_ttl
+        ):
+            return self._snapshot
+
+        if self._snapshot_task is None:
+            self._snapshot_task = asyncio.ensure_future(self._load_snapshot())
+
+        # Shielded so a cancelled caller doesn't abort the fetch for the others
+        return await asyncio.shield(self._snapshot_task)
+
+    async def _load_snapshot(self):
         try:
-            match = re.search(
-                r'<script id="SIGI_STATE"[^>]*>(.*?)</script>',
-                html,
-                re.DOTALL,
-            )
-            if not match:
-                return None
+            snapshot = None
+            blob = await self._fetch_sigi_state()
+
+            if blob is NOT_MODIFIED:
+                snapshot = self._snapshot
+            elif blob:
+                digest = hashlib.blake2b(blob, digest_size=16).digest()
+                if digest == self._snapshot_digest and self._snapshot is not None:
+                    snapshot = self._snapshot
+                else:
+                    # TikTok stores profile info under UserModule -> users/stats -> username
+                    snapshot = await self.transport.decode_snapshot(blob, self.username)
+                    if snapshot is not None:
+                        self._snapshot_digest = digest
+                        self.snapshot_version += 1
 
-            raw_json = match.group(1)
-            return json.loads(raw_json)
+            self._snapshot = snapshot
+            self._snapshot_at = time.monotonic()
+            return snapshot
+        finally:
+            self._snapshot_task = None
+
+    def invalidate_snapshot(self):
+        """Force the next fetch_snapshot() to go to the network."""
+        self._snapshot_at = None
+
+    # ----------------------------------------------------------------------
+    # PUBLIC: Cheap live probe
+    # ----------------------------------------------------------------------
+    async def probe_live(self):
+        """
+        Asks TikTok's live-room endpoint whether the creator is live.
+        The answer is a few hundred bytes of JSON instead of the full
+        profile page, so it can run every few seconds.
+
+        Returns True/False, or None if the probe failed.
+        """
+        url = (
+            f"https://www.tiktok.com/api-live/user/room/"
+            f"?aid=1988&sourceType=54&uniqueId={self.username}"
+        )
+        headers = {"Referer": f"https://www.tiktok.com/@{self.username}/live"}
+
+        try:
+            async with self.transport.request(url, headers=headers) as resp:
+                if resp.status != 200:
+                    return None
+                data = await resp.json(content_type=None)
+        except RateLimitedError:
+            return None
+        except Exception as e:
+            log.error(f"[TikTokAPI] Live probe failed for @{self.username}: {e}")
+            return None
+
+        try:
+            user = (data.get("data") or {}).get("user") or {}
+            if "status" not in user:
+                return None
+            return user["status"] == ROOM_STATUS_LIVE
         except Exception:
             return None
 
@@ -78,20 +260,15 @@ class TikTokAPI:
                 "room_id": str,
                 "thumbnail": str
             }
+        or None if the status is unknown (fetch failed or rate limited).
         """
 
-        html = await self._fetch_profile_html()
-        if not html:
-            return {"is_live": False}
-
-        data = self._extract_json(html)
-        if not data:
-            return {"is_live": False}
+        snapshot = await self.fetch_snapshot()
+        if snapshot is None:
+            return None
 
-        # TikTok stores live info under UserModule -> users -> username
-        try:
-            user_data = data["UserModule"]["users"][self.username]
-        except KeyError:
+        user_data = snapshot["user"]
+        if not user_data:
             return {"is_live": False}
 
         is_live = user_data.get("isLive", False)
@@ -128,23 +305,17 @@ class TikTokAPI:
     # PUBLIC: Fetch profile stats (followers, likes, views)
     # ----------------------------------------------------------------------
     async def fetch_profile_stats(self):
-        html = await self._fetch_profile_html()
-        if not html:
-            return {"followers": 0, "likes": 0, "views": 0}
-
-        data = self._extract_json(html)
-        if not data:
-            return {"followers": 0, "likes": 0, "views": 0}
+        """followers/likes/views, or None when the stats couldn't be fetched."""
+        snapshot = await self.fetch_snapshot()
+        stats = snapshot["stats"] if snapshot else None
+        if not stats:
+            return None
 
-        try:
-            stats = data["UserModule"]["stats"][self.username]
-            return {
-                "followers": stats.get("followerCount", 0),
-                "likes": stats.get("heartCount", 0),
-                "views": stats.get("videoCount", 0),
-            }
-        except KeyError:
-            return {"followers": 0, "likes": 0, "views": 0}
+        return {
+            "followers": stats.get("followerCount", 0),
+            "likes": stats.get("heartCount", 0),
+            "views": stats.get("videoCount", 0),
+        }
 
     # ----------------------------------------------------------------------
     # PUBLIC: Fetch latest video ID
@@ -157,22 +328,16 @@ class TikTokAPI:
             f"https://www.tiktok.com/api/post/item_list/"
             f"?uniqueId={self.username}&count=1&cursor=0"
         )
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Linux; Android 10; Mobile) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Mobile Safari/537.36"
-            ),
-            "Referer": f"https://www.tiktok.com/@{self.username}",
-        }
+        headers = {"Referer": f"https://www.tiktok.com/@{self.username}"}
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as resp:
-                    if resp.status != 200:
-                        log.error(f"[TikTokAPI] Failed to fetch videos: HTTP {resp.status}")
-                        return None
-                    data = await resp.json()
+            async with self.transport.request(url, headers=headers) as resp:
+                if resp.status != 200:
+                    log.error(f"[TikTokAPI] Failed to fetch videos: HTTP {resp.status}")
+                    return None
+                data = await resp.json()
+        except RateLimitedError:
+            return None
         except Exception as e:
             log.error(f"[TikTokAPI] Error fetching latest video: {e}")
             return None
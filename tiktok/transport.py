@@ -0,0 +1,146 @@
+import asyncio
+import aiohttp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from tiktok.rate_limiter import RateLimiter
+from tiktok.sigi_state import timed_decode
+from utils.logger import log
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Linux; Android 10; Mobile) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Mobile Safari/537.36"
+)
+
+SLOW_PARSE_MS = 250
+
+
+class TikTokTransport:
+    """
+    Resources shared by every TikTokAPI in the process: one pooled aiohttp
+    session (keep-alive, DNS cache, per-host limit), one rate limiter that
+    every request goes through, and one bounded parse pool. Call close()
+    on shutdown.
+    """
+
+    def __init__(
+        self,
+        http_config=None,
+        parsing_config=None,
+        rate_limit_config=None,
+        intervals=None,
+    ):
+        self.http_config = http_config or {}
+        self.parsing_config = parsing_config or {}
+        self.rate_limiter = RateLimiter(rate_limit_config, intervals)
+        self._session = None
+        self._executor = None
+
+        # Parse timings (ms)
+        self.last_parse_ms = 0.0
+        self.parse_count = 0
+        self.parse_total_ms = 0.0
+
+    # ----------------------------------------------------------------------
+    # Shared HTTP session
+    # ----------------------------------------------------------------------
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Lazily create the pooled session (it must be created inside the
+        running event loop) and recreate it if it was closed.
+        """
+        if self._session is None or self._session.closed:
+            cfg = self.http_config
+            connector = aiohttp.TCPConnector(
+                limit_per_host=int(cfg.get("limit_per_host", 4)),
+                ttl_dns_cache=int(cfg.get("dns_cache_ttl", 300)),
+                keepalive_timeout=float(cfg.get("keepalive_timeout", 60)),
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=float(cfg.get("timeout", 20)),
+                connect=float(cfg.get("connect_timeout", 10)),
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=timeout,
+                headers={"User-Agent": USER_AGENT},
+            )
+        return self._session
+
+    @asynccontextmanager
+    async def request(self, url: str, headers=None):
+        """
+        GET through the shared rate limiter. Raises RateLimitedError while
+        TikTok is blocking us; the response status is fed back to the
+        limiter so 429/5xx answers trigger backoff.
+        """
+        await self.rate_limiter.acquire()
+        session = self.get_session()
+        async with session.get(url, headers=headers) as resp:
+            self.rate_limiter.report(resp.status, resp.headers.get("Retry-After"))
+            yield resp
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # ----------------------------------------------------------------------
+    # Parse pool
+    # ----------------------------------------------------------------------
+    def _get_executor(self):
+        """
+        Returns the bounded parse pool, or None for inline parsing.
+        Android/Termux may lack the semaphores ProcessPoolExecutor needs,
+        in which case we fall back to a thread pool.
+        """
+        if self._executor is None:
+            kind = self.parsing_config.get("executor", "thread")
+            workers = int(self.parsing_config.get("workers", 1))
+
+            if kind == "process":
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=workers)
+                except (ImportError, OSError, NotImplementedError) as e:
+                    log.warning(f"[TikTokAPI] Process pool unavailable ({e}), using threads.")
+                    kind = "thread"
+
+            if kind == "thread":
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="tiktok-parse"
+                )
+
+        return self._executor
+
+    async def decode_snapshot(self, blob: bytes, username: str):
+        mode = self.parsing_config.get("mode", "targeted")
+        executor = self._get_executor()
+
+        if executor is None:
+            snapshot, elapsed_ms = timed_decode(blob, username, mode)
+        else:
+            loop = asyncio.get_running_loop()
+            snapshot, elapsed_ms = await loop.run_in_executor(
+                executor, timed_decode, blob, username, mode
+            )
+
+        self.last_parse_ms = elapsed_ms
+        self.parse_count += 1
+        self.parse_total_ms += elapsed_ms
+        if elapsed_ms > SLOW_PARSE_MS:
+            log.warning(f"[TikTokAPI] Slow profile parse for @{username}: {elapsed_ms:.0f} ms")
+
+        return snapshot
+
+    def get_parse_stats(self):
+        avg = self.parse_total_ms / self.parse_count if self.parse_count else 0.0
+        return {
+            "count": self.parse_count,
+            "last_ms": round(self.last_parse_ms, 2),
+            "avg_ms": round(avg, 2),
+        }
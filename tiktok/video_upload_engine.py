@@ -1,29 +1,27 @@
-import asyncio
 from utils.logger import log
 
 
 class VideoUploadEngine:
-    def __init__(self, cfg_mgr, tiktok_client, interval_minutes: int):
+    def __init__(self, cfg_mgr, tiktok_client):
         self.cfg_mgr = cfg_mgr
         self.client = tiktok_client
-        self.interval = interval_minutes  # minutes
         self.running = False
         self.last_video_id = None
         self.on_new_video = None  # callback
 
-    async def start(self):
+    def start(self):
         self.running = True
-        log.info("VideoUploadEngine started.")
 
-        while self.running:
-            video_id = await self.client.fetch_latest_video_id()
-            if video_id and video_id != self.last_video_id:
-                log.info(f"New video detected by polling: {video_id}")
-                self.last_video_id = video_id
-                if self.on_new_video:
-                    await self.on_new_video(video_id)
+    async def tick(self):
+        if not self.running:
+            return
 
-            await asyncio.sleep(self.interval * 60)
+        video_id = await self.client.fetch_latest_video_id()
+        if video_id and video_id != self.last_video_id:
+            log.info(f"New video detected by polling for @{self.client.username}: {video_id}")
+            self.last_video_id = video_id
+            if self.on_new_video:
+                await self.on_new_video(video_id)
 
     def stop(self):
         self.running = False
@@ -0,0 +1,168 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils.logger import log
+
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+# One background thread does all file I/O, so writes never block the event
+# loop and slow storage (SD cards) sees one sequential writer
+_io_executor = None
+
+
+def _get_io_executor():
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-io")
+    return _io_executor
+
+
+async def run_io(func, *args):
+    """
+    Run blocking file work on the shared I/O thread. Shielded: once
+    queued, the work runs even if the caller is cancelled (e.g. at
+    shutdown), so nothing handed over is silently dropped.
+    """
+    loop = asyncio.get_running_loop()
+    return await asyncio.shield(loop.run_in_executor(_get_io_executor(), func, *args))
+
+
+def submit_io(func, *args):
+    """
+    Queue blocking file work on the shared I/O thread without waiting for
+    it. Work runs in submission order; func should log its own errors.
+    """
+    return _get_io_executor().submit(func, *args)
+
+
+class AsyncAppendWriter:
+    """
+    Append-only text writer for per-day files.
+
+    append() only queues the line; queued lines are written together
+    batch_delay seconds later (or once max_batch lines are waiting) on the
+    shared I/O thread. The current day's file stays open between batches
+    and rotates when a line's UTC date changes. fsync policy:
+
+        always    fsync after every batch
+        interval  fsync at most every fsync_interval seconds
+        never     leave it to the OS
+    """
+
+    def __init__(
+        self,
+        path_fn,
+        fsync: str = "interval",
+        fsync_interval: float = 60,
+        batch_delay: float = 2,
+        max_batch: int = 100,
+    ):
+        self.path_fn = path_fn  # "YYYY-MM-DD" -> Path
+        self.fsync = fsync if fsync in FSYNC_POLICIES else "interval"
+        self.fsync_interval = fsync_interval
+        self.batch_delay = batch_delay
+        self.max_batch = max_batch
+
+        self._pending = []  # [(date, line)]
+        self._flush_task = None
+        self._io_lock = threading.Lock()
+        self._file = None
+        self._file_date = None
+        self._last_fsync = 0.0
+
+    # ----------------------------------------------------------------------
+    # Public
+    # ----------------------------------------------------------------------
+    def append(self, line: str, when: datetime = None):
+        date = (when or datetime.utcnow()).strftime("%Y-%m-%d")
+        self._pending.append((date, line))
+
+        if len(self._pending) >= self.max_batch:
+            self._schedule_flush(0)
+        elif self._flush_task is None:
+            self._schedule_flush(self.batch_delay)
+
+    async def flush(self):
+        """Write everything queued so far."""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            await run_io(self._write_batch, batch)
+        except Exception as e:
+            log.error(f"Failed to write {len(batch)} line(s): {e}")
+
+    async def close(self):
+        """
+        Write what is still queued and close the file. Runs on the I/O
+        thread behind any batch flush() already handed over, so lines stay
+        in order and the loop never waits on the disk.
+        """
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        batch, self._pending = self._pending, []
+        await run_io(self._close_batch, batch)
+
+    # ----------------------------------------------------------------------
+    # Internal
+    # ----------------------------------------------------------------------
+    def _schedule_flush(self, delay: float):
+        if self._flush_task and delay > 0:
+            return
+        if self._flush_task:
+            self._flush_task.cancel()
+        self._flush_task = asyncio.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            return
+        self._flush_task = None
+        await self.flush()
+
+    def _write_batch(self, batch):
+        with self._io_lock:
+            for date, line in batch:
+                if date != self._file_date:
+                    self._rotate(date)
+                self._file.write(line if line.endswith("\n") else line + "\n")
+            self._file.flush()
+
+            now = time.monotonic()
+            if self.fsync == "always" or (
+                self.fsync == "interval" and now - self._last_fsync >= self.fsync_interval
+            ):
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+
+    def _close_batch(self, batch):
+        try:
+            if batch:
+                self._write_batch(batch)
+        except Exception as e:
+            log.error(f"Failed to write {len(batch)} line(s) on close: {e}")
+        with self._io_lock:
+            self._close_file()
+
+    def _rotate(self, date: str):
+        self._close_file()
+        self._file = self.path_fn(date).open("a", encoding="utf-8")
+        self._file_date = date
+
+    def _close_file(self):
+        if self._file:
+            try:
+                self._file.flush()
+                if self.fsync != "never":
+                    os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+                self._file = None
+                self._file_date = None
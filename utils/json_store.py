@@ -1,11 +1,15 @@
 import json
+from datetime import datetime
 from typing import Any, List
 
+from utils.async_writer import AsyncAppendWriter
 
-def append_jsonl(path, data: Any):
-    """Append a JSON object as a single line."""
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(data) + "\n")
+
+class JsonlWriter(AsyncAppendWriter):
+    """Per-day JSONL files written through AsyncAppendWriter."""
+
+    def append(self, data: Any, when: datetime = None):
+        super().append(json.dumps(data), when)
 
 
 def read_jsonl(path) -> List[Any]:
@@ -21,3 +25,48 @@ def read_jsonl(path) -> List[Any]:
             except:
                 pass
     return items
+
+
+def iter_jsonl(path):
+    """
+    Valid JSON objects of a JSONL file from first to last, read lazily so
+    callers can stop early. Torn or corrupt lines are skipped.
+    """
+    if not path.exists():
+        return
+
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                pass
+
+
+def iter_jsonl_reverse(path, block_size: int = 4096):
+    """
+    Valid JSON objects of a JSONL file from last to first. Seeks back from
+    the end one block at a time, so reading the tail costs only the bytes
+    of the lines consumed. Torn or corrupt lines are skipped.
+    """
+    if not path.exists():
+        return
+
+    with path.open("rb") as f:
+        pos = f.seek(0, 2)
+        head = b""  # start of a line cut by the block boundary
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + head).split(b"\n")
+
+            # Before the first newline may be the tail of an earlier line
+            head = lines.pop(0) if pos > 0 else b""
+            for line in reversed(lines):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    pass
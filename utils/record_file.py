@@ -0,0 +1,124 @@
+import json
+import mmap
+import struct
+
+
+# magic, format version, record size, metadata length
+HEADER = struct.Struct("<4sHHI")
+VERSION = 1
+# Records start on this boundary so typed memoryview/NumPy views stay aligned
+DATA_ALIGN = 8
+
+
+class RecordFileError(Exception):
+    pass
+
+
+def _read_header(f, magic: bytes, record: struct.Struct):
+    raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise RecordFileError("truncated header")
+    file_magic, version, size, meta_len = HEADER.unpack(raw)
+    if file_magic != magic:
+        raise RecordFileError(f"bad magic {file_magic!r}")
+    if version != VERSION or size != record.size:
+        raise RecordFileError(f"unsupported layout (version {version}, record {size}B)")
+    meta = json.loads(f.read(meta_len).decode("utf-8") or "{}")
+    return meta, HEADER.size + meta_len
+
+
+class RecordWriter:
+    """
+    Append-only file of fixed-width struct records.
+
+    Layout: a small header (magic, version, record size, metadata length),
+    a JSON metadata blob, then records back to back. Record i lives at
+    data_offset + i * record.size, so readers can mmap the file and index
+    it directly. A torn last record (crash mid-write) is ignored by
+    readers and overwritten on the next append.
+    """
+
+    def __init__(self, path, record: struct.Struct, magic: bytes, meta=None):
+        self.path = path
+        self.record = record
+        self.magic = magic
+        self.meta = meta or {}
+        self._f = None
+        self.data_offset = None
+
+    def open(self):
+        if self.path.exists() and self.path.stat().st_size >= HEADER.size:
+            self._f = self.path.open("r+b")
+            self.meta, self.data_offset = _read_header(self._f, self.magic, self.record)
+            # Drop a torn trailing record so the next append stays aligned
+            end = self._f.seek(0, 2)
+            whole = (end - self.data_offset) // self.record.size
+            self._f.truncate(self.data_offset + whole * self.record.size)
+            self._f.seek(0, 2)
+        else:
+            meta = json.dumps(self.meta, separators=(",", ":")).encode("utf-8")
+            meta += b" " * (-(HEADER.size + len(meta)) % DATA_ALIGN)
+            self._f = self.path.open("wb")
+            self._f.write(HEADER.pack(self.magic, VERSION, self.record.size, len(meta)))
+            self._f.write(meta)
+            self.data_offset = HEADER.size + len(meta)
+        return self
+
+    def append(self, *values):
+        self._f.write(self.record.pack(*values))
+        self._f.flush()
+
+    def close(self):
+        if self._f:
+            self._f.close()
+            self._f = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RecordReader:
+    """Read-only mmap view over a RecordWriter file."""
+
+    def __init__(self, path, record: struct.Struct, magic: bytes):
+        self.path = path
+        self.record = record
+        self._f = path.open("rb")
+        try:
+            self.meta, self.data_offset = _read_header(self._f, magic, record)
+            size = self._f.seek(0, 2)
+            self.count = (size - self.data_offset) // record.size
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._f.close()
+            raise
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i: int):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return self.record.unpack_from(self._mm, self.data_offset + i * self.record.size)
+
+    def __iter__(self):
+        end = self.data_offset + self.count * self.record.size
+        return self.record.iter_unpack(memoryview(self._mm)[self.data_offset:end])
+
+    def close(self):
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # views handed out are still alive; the map closes once they go
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,272 @@
+import asyncio
+import heapq
+import itertools
+import math
+import random
+import time
+from utils.logger import log
+
+
+# Longest single sleep of the loop. time.monotonic() stops while the device
+# is suspended (Linux/Termux), so due times are rechecked against the wall
+# clock at least this often.
+MAX_SLEEP = 60  # seconds
+
+# Due jobs are dispatched in priority order; high-priority jobs may also
+# take the slot that normal jobs leave free
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+
+class ScheduledJob:
+    def __init__(
+        self,
+        key: str,
+        func,
+        interval_fn,
+        owner: str = None,
+        deadline: bool = False,
+        priority: int = PRIORITY_NORMAL,
+        budget=None,
+    ):
+        self.key = key
+        self.func = func                # async callable, no args
+        self.interval_fn = interval_fn  # returns seconds until the next run
+        self.owner = owner              # e.g. creator username
+        self.deadline = deadline        # interval_fn counts from now to a fixed time
+        self.priority = priority
+        self.budget = budget            # returns seconds until the job's shared budget allows a run
+        self.next_run = None            # time.monotonic() deadline
+        self.next_run_wall = None       # the same deadline as time.time()
+        self.last_run = None
+        self.running = False
+        self.cancelled = False
+        self._seq = None
+
+
+class Scheduler:
+    """
+    The one loop that runs every periodic job in the bot: per-creator
+    TikTok fetches, live sampling, daily jobs and the system monitor.
+
+    Jobs sit in a heap keyed by due time and the loop sleeps until the
+    earliest one. Due jobs move to a ready queue and are dispatched by
+    priority, then due time, at most max_concurrency at a time. Normal
+    jobs leave the last slot free so a high-priority job (live sampling)
+    never waits behind a full set of bulk fetches. A job is re-armed only
+    after it finishes, with a fresh sequence number, so creators whose
+    jobs are due together take turns instead of one creator starving the
+    rest.
+
+    A normal job with a budget callable (the TikTok rate limiter's
+    wait_time) is not dispatched while the budget is spent; it is pushed
+    back by the reported wait rather than holding a slot while it queues
+    for a token.
+
+    Each re-arm reads interval_fn, adds +-jitter and rounds the deadline
+    up to the next multiple of `align` seconds so jobs that are due close
+    together wake the loop once. refresh() re-applies interval changes to
+    jobs that are already waiting.
+
+    Deadline jobs (deadline=True) run at a wall-clock time rather than
+    every N seconds: interval_fn returns the seconds from now until that
+    time, and they get neither jitter nor alignment.
+
+    The loop never sleeps longer than MAX_SLEEP; on every wake-up, jobs
+    whose wall-clock due time has passed (the device was suspended) are
+    run right away instead of waiting out the frozen monotonic time.
+    """
+
+    def __init__(self, max_concurrency: int = 4, jitter: float = 0.0, align: float = 0.0):
+        self.max_concurrency = max_concurrency
+        self.jitter = jitter
+        self.align = align
+        self.running = False
+
+        self._jobs = {}
+        self._heap = []
+        self._ready = []
+        self._active = 0
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._tasks = set()
+
+    # ----------------------------------------------------------------------
+    # Job management
+    # ----------------------------------------------------------------------
+    def add_job(
+        self,
+        key: str,
+        func,
+        interval_fn,
+        owner: str = None,
+        delay: float = 0,
+        deadline: bool = False,
+        priority: int = PRIORITY_NORMAL,
+        budget=None,
+    ):
+        self.remove_job(key)
+        job = ScheduledJob(key, func, interval_fn, owner, deadline, priority, budget)
+        self._jobs[key] = job
+        self._push(job, time.monotonic() + delay)
+        return job
+
+    def remove_job(self, key: str):
+        job = self._jobs.pop(key, None)
+        if job:
+            job.cancelled = True
+
+    def remove_owner(self, owner: str):
+        for key in [k for k, job in self._jobs.items() if job.owner == owner]:
+            self.remove_job(key)
+
+    def has_job(self, key: str) -> bool:
+        return key in self._jobs
+
+    def get_jobs(self):
+        return list(self._jobs.values())
+
+    def refresh(self, owner: str = None):
+        """Recompute waiting jobs' deadlines from their current interval."""
+        now = time.monotonic()
+        for job in self._jobs.values():
+            if owner is not None and job.owner != owner:
+                continue
+            if job.running:
+                continue
+            if job.deadline:
+                when = now + self._interval(job)
+            elif job.last_run is None:
+                continue
+            else:
+                when = max(now, job.last_run + self._interval(job))
+            if when != job.next_run:
+                self._push(job, when)
+
+    def describe(self):
+        """[(key, seconds until next run, interval seconds, running)] sorted by due time."""
+        now = time.monotonic()
+        rows = []
+        for job in self._jobs.values():
+            due = 0.0 if job.running else max(job.next_run - now, 0.0)
+            rows.append((job.key, due, self._interval(job), job.running))
+        return sorted(rows, key=lambda r: r[1])
+
+    # ----------------------------------------------------------------------
+    # Internal
+    # ----------------------------------------------------------------------
+    def _interval(self, job: ScheduledJob) -> float:
+        try:
+            return max(float(job.interval_fn()), 1.0)
+        except Exception as e:
+            log.error(f"Scheduled job {job.key} has no valid interval: {e}")
+            return 60.0
+
+    def _next_deadline(self, job: ScheduledJob, now: float) -> float:
+        interval = self._interval(job)
+        if job.deadline:
+            return now + interval
+        if self.jitter:
+            interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        when = now + interval
+        if self.align:
+            when = math.ceil(when / self.align) * self.align
+        return when
+
+    def _push(self, job: ScheduledJob, when: float):
+        job.next_run = when
+        job.next_run_wall = time.time() + (when - time.monotonic())
+        job._seq = next(self._seq)
+        heapq.heappush(self._heap, (when, job._seq, job))
+        self._wakeup.set()
+
+    def _catch_up_suspended(self):
+        """Make jobs due now whose wall-clock time passed while monotonic time stood still."""
+        now, wall = time.monotonic(), time.time()
+        for job in self._jobs.values():
+            if job.running or job.next_run is None or job.next_run <= now:
+                continue
+            if job.next_run_wall <= wall:
+                self._push(job, now)
+
+    def _slots(self, job: ScheduledJob) -> int:
+        if job.priority <= PRIORITY_HIGH or self.max_concurrency < 2:
+            return self.max_concurrency
+        return self.max_concurrency - 1
+
+    def _dispatch_ready(self):
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            when, seq, job = heapq.heappop(self._heap)
+            if job.cancelled or seq != job._seq:
+                continue  # stale heap entry
+            heapq.heappush(self._ready, (job.priority, when, seq, job))
+
+        while self._ready:
+            _, _, seq, job = self._ready[0]
+            if job.cancelled or seq != job._seq:
+                heapq.heappop(self._ready)
+                continue
+            if self._active >= self._slots(job):
+                # Everything behind this job has the same or lower priority
+                break
+            heapq.heappop(self._ready)
+
+            if job.budget is not None and job.priority > PRIORITY_HIGH:
+                try:
+                    wait = float(job.budget())
+                except Exception as e:
+                    log.error(f"Scheduled job {job.key} budget check failed: {e}")
+                    wait = 0.0
+                if wait > 0:
+                    self._push(job, now + wait)
+                    continue
+
+            self._active += 1
+            job.running = True
+            task = asyncio.create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    # ----------------------------------------------------------------------
+    # Main loop
+    # ----------------------------------------------------------------------
+    async def start(self):
+        self.running = True
+        log.info(f"Scheduler started (max concurrency {self.max_concurrency}).")
+
+        while self.running:
+            self._catch_up_suspended()
+            self._dispatch_ready()
+
+            # A finishing job sets _wakeup, so jobs left in _ready get its slot
+            timeout = self._heap[0][0] - time.monotonic() if self._heap else MAX_SLEEP
+            timeout = min(timeout, MAX_SLEEP)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, job: ScheduledJob):
+        try:
+            await job.func()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error(f"Scheduled job {job.key} failed: {e}")
+        finally:
+            now = time.monotonic()
+            job.running = False
+            job.last_run = now
+            self._active -= 1
+            if not job.cancelled and self.running:
+                self._push(job, self._next_deadline(job, now))
+            self._wakeup.set()
+
+    def stop(self):
+        self.running = False
+        for job in self._jobs.values():
+            job.cancelled = True
+        for task in list(self._tasks):
+            task.cancel()
+        self._wakeup.set()
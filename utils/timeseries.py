@@ -0,0 +1,106 @@
+import struct
+
+from utils.record_file import RecordReader, RecordWriter
+
+try:
+    import numpy
+except ImportError:  # optional, only for as_numpy()
+    numpy = None
+
+
+TS_MAGIC = b"TTTS"
+# timestamp (unix seconds), followers, likes, video count
+TS_RECORD = struct.Struct("<dqqq")
+TS_FIELDS = ("t", "followers", "likes", "videos")
+_STRIDE = len(TS_FIELDS)  # record size in 8-byte words
+
+
+class TimeSeriesStore:
+    """
+    Append-only profile stats series on top of utils.record_file: fixed
+    32-byte records, timestamps non-decreasing. Appends are one small
+    write; reads go through TimeSeriesReader.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._writer = None
+        self._last_t = None
+
+    def append(self, t: float, followers: int, likes: int, videos: int):
+        if self._writer is None:
+            self._writer = RecordWriter(self.path, TS_RECORD, TS_MAGIC).open()
+            if self.path.stat().st_size > self._writer.data_offset:
+                with self.reader() as r:
+                    self._last_t = r.t(len(r) - 1)
+        if self._last_t is not None and t < self._last_t:
+            return  # keep the file sorted so lookups can binary search
+        self._writer.append(t, followers, likes, videos)
+        self._last_t = t
+
+    def reader(self):
+        return TimeSeriesReader(self.path)
+
+    def close(self):
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+
+class TimeSeriesReader(RecordReader):
+    """
+    mmap view of a TimeSeriesStore file. Lookups binary search the
+    timestamps in place; column() returns zero-copy strided memoryviews
+    over the mapped file (native byte order; the file is little-endian, as
+    are Termux/x86 hosts), as_numpy() a zero-copy structured array. Views
+    must be dropped before close() can unmap the file.
+    """
+
+    def __init__(self, path):
+        super().__init__(path, TS_RECORD, TS_MAGIC)
+
+    def t(self, i: int) -> float:
+        return struct.unpack_from("<d", self._mm, self.data_offset + i * TS_RECORD.size)[0]
+
+    def bisect(self, t: float) -> int:
+        """Index of the first record with timestamp >= t."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.t(mid) < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def span(self, t0: float, t1: float):
+        """(start, stop) record indexes covering t0 <= t <= t1."""
+        return self.bisect(t0), self.bisect(t1 + 1e-6)
+
+    def at(self, t: float):
+        """The last record at or before t (the value in effect then), or None."""
+        i = self.bisect(t + 1e-6) - 1
+        return dict(zip(TS_FIELDS, self[i])) if i >= 0 else None
+
+    def _words(self, start: int, stop: int, code: str):
+        begin = self.data_offset + start * TS_RECORD.size
+        end = self.data_offset + stop * TS_RECORD.size
+        return memoryview(self._mm)[begin:end].cast(code)
+
+    def column(self, name: str, start: int = 0, stop: int = None):
+        """Zero-copy view of one field for records [start, stop)."""
+        stop = self.count if stop is None else stop
+        field = TS_FIELDS.index(name)
+        words = self._words(start, stop, "d" if name == "t" else "q")
+        return words[field::_STRIDE]
+
+    def as_numpy(self, start: int = 0, stop: int = None):
+        """Zero-copy NumPy structured array of records [start, stop)."""
+        if numpy is None:
+            raise RuntimeError("NumPy is not installed")
+        stop = self.count if stop is None else stop
+        dtype = numpy.dtype([(name, "<f8" if name == "t" else "<i8") for name in TS_FIELDS])
+        return numpy.frombuffer(
+            self._mm, dtype=dtype, count=stop - start,
+            offset=self.data_offset + start * TS_RECORD.size,
+        )